@@ -0,0 +1,96 @@
+"""Micro-benchmarks for the per-request work on the /weather hot path.
+
+Run from the repository root:
+
+    python -m benchmarks.request_path
+
+Each case is measured for CPU time (``time.process_time``) and wall time per
+operation, and for memory allocated per operation (tracemalloc peak). No
+network call is made: hits read a warmed cache and misses are served by the
+fixture provider from ``fixtures/``.
+
+For the numbers before the hit path was trimmed, check out 8cf2655, the parent
+of 19e6064, and run the 19e6064 version of this script there (``git show
+19e6064:benchmarks/request_path.py``). That version only has the
+``build service`` and ``cache hit`` cases and reports wall time as us/op.
+"""
+
+import asyncio
+import os
+import time
+import tracemalloc
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from services.providers import FixtureProvider, init_weather_provider
+from services.weather import WeatherService
+from validation.weather import WeatherRequest
+
+ITERATIONS = 20_000
+PAYLOAD = {"city": "Kyiv", "cache_ttl": 600}
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class BenchRequest:
+    headers: dict = {}
+
+
+def build_service() -> WeatherService:
+    return WeatherService(WeatherRequest(**PAYLOAD), BenchRequest())
+
+
+async def cache_hit() -> None:
+    await build_service().get_weather()
+
+
+async def fixture_forecast_miss() -> None:
+    weather_request = WeatherRequest(**PAYLOAD, cache_bypass=True)
+    await WeatherService(weather_request, BenchRequest()).get_view("forecast")
+
+
+async def _measure(name: str, func, is_async: bool) -> None:
+    async def run_once():
+        if is_async:
+            await func()
+        else:
+            func()
+
+    for _ in range(1000):
+        await run_once()
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for _ in range(ITERATIONS):
+        await run_once()
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(1000):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await run_once()
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    print(
+        f"{name:<20} {cpu / ITERATIONS * 1e6:8.2f} us/op CPU "
+        f"{wall / ITERATIONS * 1e6:8.2f} us/op wall "
+        f"{peak_total / 1000:8.0f} B/op peak"
+    )
+
+
+async def main() -> None:
+    FastAPICache.init(InMemoryBackend())
+    init_weather_provider(FixtureProvider.from_directory(FIXTURE_DIR))
+    await FastAPICache.get_backend().set(
+        "current:kyiv",
+        b'{"city": "kyiv", "weather condition": "Sunny", '
+        b'"actual temperature": "+25\\u00b0C"}',
+        expire=3600,
+    )
+    await _measure("build service", build_service, is_async=False)
+    await _measure("cache hit", cache_hit, is_async=True)
+    await _measure("forecast miss", fixture_forecast_miss, is_async=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,5 +10,32 @@ class HTTPResponseCode(Enum):
     BAD_GATEWAY = 502
 
 
+class Units(str, Enum):
+    METRIC = "metric"
+    IMPERIAL = "imperial"
+
+
+class Language(str, Enum):
+    ENGLISH = "en"
+    UKRAINIAN = "uk"
+    GERMAN = "de"
+    FRENCH = "fr"
+    SPANISH = "es"
+
+
 DEFAULT_CACHE_TTL = 60 * 60  # 1 hour
 MAX_CACHE_TTL = 60 * 60 * 24 * 30  # 1 month
+CACHE_TTL_JITTER = 0.1  # up to 10% of TTL is shaved off on write
+XFETCH_BETA = 1.0  # > 1.0 favours earlier recomputation, < 1.0 later
+FETCH_COST_MAX_KEYS = 10_000  # bound for remembered per-key fetch costs
+FETCH_LEASE_TTL = 30  # seconds a Redis fetch lease outlives a crashed holder
+FETCH_LEASE_WAIT = 5  # seconds a worker waits for the lease holder's entry
+FETCH_LEASE_POLL_INTERVAL = 0.05  # seconds between cache re-reads while waiting
+PROVIDER_MAX_FAILURES = 3  # failures in a row before a provider is skipped
+PROVIDER_COOLDOWN = 30  # seconds an unhealthy provider is skipped for
+PROVIDER_LATENCY_SMOOTHING = 0.3  # weight of the newest latency sample
+MAX_BATCH_CITIES = 50  # cities per /weather/batch request
+COMPRESSION_MIN_SIZE = 500  # bytes, smaller bodies are sent uncompressed
+COMPRESSED_BODIES_MAX_BYTES = 4 * 1024 * 1024  # compressed cache hit bodies
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
@@ -16,3 +16,7 @@ class WeatherServiceError(ServiceError):
 
 class CacheServiceError(ServiceError):
     """Raise when there is an error in cache service."""
+
+
+class UpstreamUnavailableError(WeatherServiceError):
+    """Raise when an upstream weather provider is unreachable or failing."""
@@ -1,5 +1,6 @@
 """API main module."""
 
+import os
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
@@ -8,14 +9,50 @@ from fastapi import FastAPI
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 
+from middlware.compression import CompressionMiddleware
 from middlware.error_handler import ErrorHandlerMiddleware
 from routes.weather import weather_router
+from services.lease import create_fetch_lease, init_fetch_lease
+from services.providers import create_provider, init_weather_provider
+from services.trace import TraceRecorder, init_trace_recorder
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
-    FastAPICache.init(InMemoryBackend())
+    redis_client = None
+    redis_url = os.environ.get("REDIS_URL")
+    if redis_url:
+        # redis is only needed when a shared cache is configured.
+        from fastapi_cache.backends.redis import RedisBackend
+        from redis import asyncio as aioredis
+
+        redis_client = aioredis.from_url(redis_url)
+        FastAPICache.init(RedisBackend(redis_client))
+    else:
+        FastAPICache.init(InMemoryBackend())
+    init_weather_provider(
+        create_provider(
+            os.environ.get("WEATHER_PROVIDERS", "wttr").split(","),
+            os.environ.get("WEATHER_PROVIDER_STRATEGY", "ordered"),
+            os.environ.get("WEATHER_FIXTURE_DIR"),
+        )
+    )
+    init_fetch_lease(
+        create_fetch_lease(
+            FastAPICache.get_backend(),
+            os.environ.get("FETCH_LEASE_DIR"),
+            redis_client,
+        )
+    )
+    trace_recorder = None
+    trace_path = os.environ.get("CACHE_TRACE_PATH")
+    if trace_path:
+        trace_recorder = TraceRecorder(trace_path)
+        init_trace_recorder(trace_recorder)
     yield
+    if trace_recorder:
+        init_trace_recorder(None)
+        trace_recorder.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -24,6 +61,7 @@ app = FastAPI(lifespan=lifespan)
 app.include_router(weather_router)
 
 app.add_middleware(ErrorHandlerMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+"""Response compression middleware module."""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+import brotli
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from constants import (BROTLI_QUALITY, COMPRESSED_BODIES_MAX_BYTES,
+                       COMPRESSION_MIN_SIZE, GZIP_LEVEL)
+
+# Preferred encoding first.
+_encoders = {
+    "br": lambda body: brotli.compress(body, quality=BROTLI_QUALITY),
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+}
+
+_streaming_media_types = ("application/x-ndjson", "text/event-stream")
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding allowed by an Accept-Encoding header."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in _encoders:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Negotiated brotli/gzip compression of response bodies.
+
+    Compressed bodies of cache hits (``X-Cache-Status: HIT``) are kept in an
+    LRU keyed by encoding and body digest and bounded by
+    COMPRESSED_BODIES_MAX_BYTES, so a hit rendering the same body is not
+    compressed again. Streaming responses are passed through untouched to keep
+    their time-to-first-byte.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._compressed_bodies: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._compressed_bytes = 0
+        super().__init__(*args, **kwargs)
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        encoding = select_encoding(request.headers.get("Accept-Encoding", ""))
+        if (
+            encoding is None
+            or "Content-Encoding" in response.headers
+            or response.headers.get("Content-Type", "").startswith(
+                _streaming_media_types
+            )
+        ):
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        compressed = len(body) >= COMPRESSION_MIN_SIZE
+        if compressed:
+            if response.headers.get("X-Cache-Status") == "HIT":
+                body = self._compress_cached(encoding, body)
+            else:
+                body = _encoders[encoding](body)
+        new_response = Response(
+            content=body,
+            status_code=response.status_code,
+            background=response.background,
+        )
+        # Keep repeated headers such as Set-Cookie, only the length changes.
+        new_response.raw_headers = [
+            (name, value)
+            for name, value in response.raw_headers
+            if name != b"content-length"
+        ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+        if compressed:
+            new_response.headers["Content-Encoding"] = encoding
+            new_response.headers.add_vary_header("Accept-Encoding")
+        return new_response
+
+    def _compress_cached(self, encoding: str, body: bytes) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self._compressed_bodies.get(key)
+        if compressed is not None:
+            self._compressed_bodies.move_to_end(key)
+            return compressed
+        compressed = _encoders[encoding](body)
+        if len(compressed) > COMPRESSED_BODIES_MAX_BYTES:
+            return compressed
+        while self._compressed_bytes + len(compressed) > COMPRESSED_BODIES_MAX_BYTES:
+            _, evicted = self._compressed_bodies.popitem(last=False)
+            self._compressed_bytes -= len(evicted)
+        self._compressed_bodies[key] = compressed
+        self._compressed_bytes += len(compressed)
+        return compressed
@@ -1,19 +1,20 @@
 """Weather route module."""
 
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 from constants import HTTPResponseCode
-from services.weather import WeatherService
-from validation.weather import WeatherRequest
+from services.cache import CacheService
+from services.weather import WeatherService, iter_weather_batch
+from validation.weather import WeatherBatchRequest, WeatherRequest
 
 weather_router = APIRouter(prefix="/weather", tags=["weather"])
 
 
-@weather_router.post("/")
-async def get_weather(weather_request: WeatherRequest, request: Request):
-    weather_service = WeatherService(weather_request, request)
-    cache_ttl, cache_hit, response = await weather_service.get_weather()
+def _cached_response(cache_ttl: int, cache_hit: bool, response: dict) -> JSONResponse:
     cache_status = "HIT" if cache_hit else "MISS"
     headers = {
         "X-Cache-Status": cache_status,
@@ -24,3 +25,54 @@ async def get_weather(weather_request: WeatherRequest, request: Request):
         content=response,
         headers=headers,
     )
+
+
+@weather_router.post("/")
+async def get_weather(weather_request: WeatherRequest, request: Request):
+    weather_service = WeatherService(weather_request, request)
+    return _cached_response(*await weather_service.get_weather())
+
+
+@weather_router.post("/current")
+async def get_current(weather_request: WeatherRequest, request: Request):
+    weather_service = WeatherService(weather_request, request)
+    return _cached_response(*await weather_service.get_view("current"))
+
+
+@weather_router.post("/hourly")
+async def get_hourly(weather_request: WeatherRequest, request: Request):
+    weather_service = WeatherService(weather_request, request)
+    return _cached_response(*await weather_service.get_view("hourly"))
+
+
+@weather_router.post("/forecast")
+async def get_forecast(weather_request: WeatherRequest, request: Request):
+    weather_service = WeatherService(weather_request, request)
+    return _cached_response(*await weather_service.get_view("forecast"))
+
+
+async def _ndjson_lines(results: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for result in results:
+        yield (json.dumps(result, ensure_ascii=False) + "\n").encode()
+
+
+@weather_router.post("/batch")
+async def get_weather_batch(batch_request: WeatherBatchRequest, request: Request):
+    # Invalid cache headers fail the whole request, as they do for /weather/.
+    CacheService.parse_cache_headers(request)
+    results = iter_weather_batch(batch_request, request)
+    if "application/x-ndjson" in request.headers.get("Accept", ""):
+        return StreamingResponse(
+            _ndjson_lines(results), media_type="application/x-ndjson"
+        )
+    by_city = {result["city"]: result async for result in results}
+    ordered = [by_city[city] for city in batch_request.cities]
+    cached = [result for result in ordered if "error" not in result]
+    all_hits = len(cached) == len(ordered) and all(
+        result["cache_status"] == "HIT" for result in cached
+    )
+    return _cached_response(
+        min((result["cache_ttl"] for result in cached), default=0),
+        all_hits,
+        {"results": ordered},
+    )
@@ -1,25 +1,123 @@
 """Cached service module."""
 
+import asyncio
 import json
 import logging
+import math
+import random
+import time
 from functools import wraps
-from typing import Callable
+from operator import attrgetter
+from typing import Callable, Optional
 
 from fastapi import Request
 from fastapi_cache import FastAPICache
 from fastapi_cache.types import Backend
 
-from constants import DEFAULT_CACHE_TTL, MAX_CACHE_TTL, HTTPResponseCode
-from exceptions import CacheServiceError
+from constants import (CACHE_TTL_JITTER, DEFAULT_CACHE_TTL,
+                       FETCH_COST_MAX_KEYS, FETCH_LEASE_POLL_INTERVAL,
+                       FETCH_LEASE_TTL, FETCH_LEASE_WAIT, MAX_CACHE_TTL,
+                       XFETCH_BETA, HTTPResponseCode)
+from exceptions import CacheServiceError, ServiceError
+from services.lease import get_fetch_lease
+from services.trace import get_trace_recorder
 from validation.cache import CacheRequest
 
+# Skips json.loads' argument and encoding checks on every cache hit.
+_decode_json = json.JSONDecoder().decode
 
-def cache(key_field: str) -> Callable:
-    """Decorator to apply cache logic to methods of CacheService child classes."""
+# Observed upstream fetch cost (seconds) per cache key, used by XFetch.
+_fetch_costs: dict[str, float] = {}
+
+
+def _remember_fetch_cost(key: str, cost: float) -> None:
+    _fetch_costs.pop(key, None)
+    if len(_fetch_costs) >= FETCH_COST_MAX_KEYS:
+        _fetch_costs.pop(next(iter(_fetch_costs)))
+    _fetch_costs[key] = cost
+
+
+def _should_refresh_early(key: str, cache_ttl: int, beta: float) -> bool:
+    """XFetch: recompute early with a probability growing towards expiry."""
+    cost = _fetch_costs.get(key)
+    if not cost or cache_ttl <= 0 or beta <= 0:
+        return False
+    return -cost * beta * math.log(1.0 - random.random()) >= cache_ttl
+
+
+def _jittered_ttl(cache_ttl: int, jitter: float) -> int:
+    """Shave a random part of the TTL off so that entries don't expire together."""
+    max_shave = int(cache_ttl * jitter)
+    if max_shave <= 0:
+        return cache_ttl
+    return max(1, cache_ttl - random.randint(0, max_shave))
+
+
+async def _fetch_and_store(
+    object_: "CacheService", key: str, func: Callable, *args, **kwargs
+) -> dict:
+    started = time.perf_counter()
+    response = await func(object_, *args, **kwargs)
+    _remember_fetch_cost(key, time.perf_counter() - started)
+    await object_.cache_backend.set(
+        key,
+        json.dumps(response).encode(),
+        expire=_jittered_ttl(object_.cache_ttl, object_.cache_ttl_jitter),
+    )
+    return response
+
+
+async def _fetch_single_flight(
+    object_: "CacheService",
+    key: str,
+    cache_ttl: int,
+    cached_data: Optional[bytes],
+    func: Callable,
+    *args,
+    **kwargs,
+) -> tuple[int, bool, dict]:
+    """Fetch under the fetch lease so that one worker calls upstream per key."""
+    lease = get_fetch_lease()
+    if lease is None:
+        return 0, False, await _fetch_and_store(object_, key, func, *args, **kwargs)
+    token = await lease.acquire(key, FETCH_LEASE_TTL)
+    if token is None:
+        if cached_data:
+            # Another worker already refreshes this entry, serve the current one.
+            return cache_ttl, True, _decode_json(cached_data.decode())
+        deadline = time.monotonic() + FETCH_LEASE_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(FETCH_LEASE_POLL_INTERVAL)
+            cache_ttl, cached_data = await object_.cache_backend.get_with_ttl(key)
+            if cached_data:
+                return cache_ttl, True, _decode_json(cached_data.decode())
+        object_._log.warning(
+            "Fetch lease for cache key %s was not released in time", key
+        )
+        return 0, False, await _fetch_and_store(object_, key, func, *args, **kwargs)
+    try:
+        if not cached_data:
+            # The previous holder may have written the entry just before.
+            cache_ttl, cached_data = await object_.cache_backend.get_with_ttl(key)
+            if cached_data:
+                return cache_ttl, True, _decode_json(cached_data.decode())
+        return 0, False, await _fetch_and_store(object_, key, func, *args, **kwargs)
+    finally:
+        await lease.release(key, token)
+
+
+def cache(key_field: str, namespace: str = "") -> Callable:
+    """Decorator to apply cache logic to methods of CacheService child classes.
+
+    The namespace is prepended to the key so that several cached methods can
+    share the same key field. Such methods need distinct namespaces ending in
+    a separator, so that no key value can make their keys collide.
+    """
+
+    get_key = attrgetter(key_field)
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(
+        async def cached_call(
             object_: CacheService, *args, **kwargs
         ) -> tuple[int, bool, dict]:
             cache_ttl = 0  # default cache Time to Live as zero
@@ -28,21 +126,71 @@ def cache(key_field: str) -> Callable:
                 response = await func(object_, *args, **kwargs)
             else:
                 try:
-                    key = getattr(object_.cache_request, key_field)
+                    key = get_key(object_.cache_request)
                 except AttributeError:
                     raise CacheServiceError(
                         "Incorrect cache key field setup",
                         HTTPResponseCode.INTERNAL_SERVER_ERROR.value,
                     )
+                if namespace:
+                    key = namespace + key
                 cache_ttl, cached_data = await object_.cache_backend.get_with_ttl(key)
-                if cached_data:
-                    response = json.loads(cached_data.decode())
+                if cached_data and not _should_refresh_early(
+                    key, cache_ttl, object_.xfetch_beta
+                ):
+                    response = _decode_json(cached_data.decode())
                     cache_hit = True
                 else:
-                    response = await func(object_, *args, **kwargs)
-                    await object_.cache_backend.set(
-                        key, json.dumps(response).encode(), expire=object_.cache_ttl
-                    )
+                    if cached_data:
+                        object_._log.debug(
+                            "Early refresh of cache key %s, %s seconds left",
+                            key,
+                            cache_ttl,
+                        )
+                    try:
+                        cache_ttl, cache_hit, response = await _fetch_single_flight(
+                            object_, key, cache_ttl, cached_data, func, *args, **kwargs
+                        )
+                    except ServiceError as err:
+                        if not cached_data:
+                            raise
+                        # The entry is still valid, a failed early refresh
+                        # must not turn a cache hit into an error.
+                        object_._log.warning(
+                            "Early refresh of cache key %s failed: %s", key, err
+                        )
+                        response = _decode_json(cached_data.decode())
+                        cache_hit = True
+            return cache_ttl, cache_hit, response
+
+        @wraps(func)
+        async def wrapper(
+            object_: CacheService, *args, **kwargs
+        ) -> tuple[int, bool, dict]:
+            recorder = get_trace_recorder()
+            if recorder is None:
+                return await cached_call(object_, *args, **kwargs)
+            started = time.perf_counter()
+            # Failed upstream calls are traced too, flagged as errors.
+            cache_hit, error = False, True
+            try:
+                cache_ttl, cache_hit, response = await cached_call(
+                    object_, *args, **kwargs
+                )
+                error = False
+            finally:
+                try:
+                    key = namespace + get_key(object_.cache_request)
+                except AttributeError:
+                    key = None
+                recorder.record(
+                    key,
+                    object_.cache_ttl,
+                    bool(object_.cache_bypass),
+                    cache_hit,
+                    None if cache_hit else time.perf_counter() - started,
+                    error,
+                )
             return cache_ttl, cache_hit, response
 
         return wrapper
@@ -51,21 +199,32 @@ def cache(key_field: str) -> Callable:
 
 
 class CacheService:
+    __slots__ = (
+        "_cache_request",
+        "_request",
+        "_cache_backend",
+        "_cache_ttl",
+        "_cache_bypass",
+    )
+    _log = logging.getLogger("CacheService")
+    # Fraction of the TTL that may be randomly shaved off on cache writes.
+    cache_ttl_jitter: float = CACHE_TTL_JITTER
+    # XFetch weight, 0 disables probabilistic early recomputation.
+    xfetch_beta: float = XFETCH_BETA
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._log = logging.getLogger(cls.__name__)
 
     def __init__(self, cache_request: CacheRequest, request: Request):
-        self._log = logging.getLogger(self.__class__.__name__)
         self._cache_request = cache_request
         self._request = request
-        self._cache_backend = FastAPICache().get_backend()
-        header_cache_ttl = request.headers.get("X-Cache-TTL")
-        if header_cache_ttl:
-            header_cache_ttl = self._parse_cache_ttl_header(header_cache_ttl)
+        # Looked up on first use, a cache bypass never touches the backend.
+        self._cache_backend = None
+        header_cache_ttl, header_cache_bypass = self.parse_cache_headers(request)
         self._cache_ttl = (
             header_cache_ttl or cache_request.cache_ttl or DEFAULT_CACHE_TTL
         )
-        header_cache_bypass = request.headers.get("X-Cache-Bypass")
-        if header_cache_bypass:
-            header_cache_bypass = self._parse_cache_bypass_header(header_cache_bypass)
         self._cache_bypass = header_cache_bypass or cache_request.cache_bypass
         if self._cache_ttl > MAX_CACHE_TTL:
             self._log.warning(
@@ -87,8 +246,23 @@ class CacheService:
 
     @property
     def cache_backend(self) -> Backend:
+        if self._cache_backend is None:
+            self._cache_backend = FastAPICache().get_backend()
         return self._cache_backend
 
+    @classmethod
+    def parse_cache_headers(
+        cls, request: Request
+    ) -> tuple[Optional[int], Optional[bool]]:
+        """Return X-Cache-TTL and X-Cache-Bypass, raising on invalid values."""
+        header_cache_ttl = request.headers.get("X-Cache-TTL")
+        if header_cache_ttl:
+            header_cache_ttl = cls._parse_cache_ttl_header(header_cache_ttl)
+        header_cache_bypass = request.headers.get("X-Cache-Bypass")
+        if header_cache_bypass:
+            header_cache_bypass = cls._parse_cache_bypass_header(header_cache_bypass)
+        return header_cache_ttl, header_cache_bypass
+
     @staticmethod
     def _parse_cache_ttl_header(value: str):
         try:
@@ -0,0 +1,123 @@
+"""Rich forecast module.
+
+wttr.in's full JSON payload (``format=j1``) is parsed once into a compact
+metric English record. The ``current``, ``hourly`` and ``forecast`` views are
+projections of that record, so they share one upstream fetch and cache entry.
+"""
+
+import json
+
+from constants import HTTPResponseCode, Language, Units
+from exceptions import WeatherServiceError
+from services.localization import (celsius_to_fahrenheit, kmph_to_mph,
+                                   mm_to_inches, translate_condition)
+
+FORECAST_VIEWS = ("current", "hourly", "forecast")
+
+_temperature_fields = (
+    "temperature",
+    "feels_like",
+    "min_temperature",
+    "max_temperature",
+    "avg_temperature",
+)
+
+
+def _condition(entry: dict) -> str:
+    return entry["weatherDesc"][0]["value"].strip()
+
+
+def _hour(time: str) -> str:
+    return f"{int(time) // 100:02d}:00"
+
+
+def parse_j1(city: str, payload: str) -> dict:
+    """Parse a wttr.in j1 payload into the compact record that gets cached."""
+    try:
+        data = json.loads(payload)
+        current = data["current_condition"][0]
+        record = {
+            "city": city,
+            "current": {
+                "condition": _condition(current),
+                "temperature": int(current["temp_C"]),
+                "feels_like": int(current["FeelsLikeC"]),
+                "humidity": int(current["humidity"]),
+                "wind_speed": int(current["windspeedKmph"]),
+                "wind_direction": current["winddir16Point"],
+                "pressure": int(current["pressure"]),
+                "precipitation": float(current["precipMM"]),
+            },
+            "days": [
+                {
+                    "date": day["date"],
+                    "min_temperature": int(day["mintempC"]),
+                    "max_temperature": int(day["maxtempC"]),
+                    "avg_temperature": int(day["avgtempC"]),
+                    "sun_hours": float(day["sunHour"]),
+                    "hourly": [
+                        {
+                            "time": _hour(hour["time"]),
+                            "condition": _condition(hour),
+                            "temperature": int(hour["tempC"]),
+                            "feels_like": int(hour["FeelsLikeC"]),
+                            "humidity": int(hour["humidity"]),
+                            "wind_speed": int(hour["windspeedKmph"]),
+                            "chance_of_rain": int(hour["chanceofrain"]),
+                            "precipitation": float(hour["precipMM"]),
+                        }
+                        for hour in day["hourly"]
+                    ],
+                }
+                for day in data["weather"]
+            ],
+        }
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise WeatherServiceError(
+            message=f"Fail to parse weather response for {city}",
+            status_code=HTTPResponseCode.INTERNAL_SERVER_ERROR.value,
+        )
+    return record
+
+
+def _localize(entry: dict, units: Units, lang: Language) -> dict:
+    localized = dict(entry)
+    if "condition" in localized:
+        localized["condition"] = translate_condition(localized["condition"], lang)
+    if units == Units.IMPERIAL:
+        for field in _temperature_fields:
+            if field in localized:
+                localized[field] = celsius_to_fahrenheit(localized[field])
+        if "wind_speed" in localized:
+            localized["wind_speed"] = kmph_to_mph(localized["wind_speed"])
+        if "precipitation" in localized:
+            localized["precipitation"] = mm_to_inches(localized["precipitation"])
+    return localized
+
+
+def project_view(record: dict, view: str, units: Units, lang: Language) -> dict:
+    """Build one of FORECAST_VIEWS from the cached record."""
+    response = {"city": record["city"], "units": units.value}
+    if view == "current":
+        response.update(_localize(record["current"], units, lang))
+    elif view == "hourly":
+        response["hourly"] = [
+            _localize({"date": day["date"], **hour}, units, lang)
+            for day in record["days"]
+            for hour in day["hourly"]
+        ]
+    elif view == "forecast":
+        response["days"] = [
+            _localize(
+                {key: value for key, value in day.items() if key != "hourly"},
+                units,
+                lang,
+            )
+            for day in record["days"]
+        ]
+    else:
+        raise WeatherServiceError(
+            message=f"Unknown forecast view {view}",
+            status_code=HTTPResponseCode.BAD_REQUEST.value,
+        )
+    return response
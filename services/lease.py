@@ -0,0 +1,142 @@
+"""Fetch lease module.
+
+A fetch lease lets only one worker run the upstream call for a missing cache
+key while the others wait for the entry it writes.
+"""
+
+import abc
+import fcntl
+import hashlib
+import logging
+import os
+import secrets
+from typing import Any, Optional
+
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.types import Backend
+
+_log = logging.getLogger(__name__)
+
+
+class FetchLease(abc.ABC):
+
+    @abc.abstractmethod
+    async def acquire(self, key: str, ttl: float) -> Optional[str]:
+        """Return a lease token if the lease was taken, None if it is held."""
+
+    @abc.abstractmethod
+    async def release(self, key: str, token: str) -> None:
+        """Release the lease if it is still owned by the token."""
+
+
+class FileLease(FetchLease):
+    """Host-local lease built on flock, shared by all workers of one host.
+
+    The kernel drops the lock together with the holder process, so a crashed
+    worker never leaves a stale lease behind. The holder unlinks the lock file
+    before unlocking it, so the directory only holds files of keys being
+    fetched; a worker that locked an already unlinked file retries on the
+    current one.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._handles: dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self._directory, f"{name}.lock")
+
+    async def acquire(self, key: str, ttl: float) -> Optional[str]:
+        path = self._path(key)
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return None
+            try:
+                if os.stat(path).st_ino == os.fstat(fd).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            # The previous holder unlinked this file before unlocking it.
+            os.close(fd)
+        token = secrets.token_hex(8)
+        self._handles[token] = fd
+        return token
+
+    async def release(self, key: str, token: str) -> None:
+        fd = self._handles.pop(token, None)
+        if fd is not None:
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+class RedisLease(FetchLease):
+    """Lease stored as a Redis key taken with SET NX and an expiry.
+
+    The expiry covers crashed holders: the key vanishes after ``ttl`` seconds.
+    """
+
+    _release_script = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, client: Any, prefix: str = "lease:"):
+        self._client = client
+        self._prefix = prefix
+
+    async def acquire(self, key: str, ttl: float) -> Optional[str]:
+        token = secrets.token_hex(8)
+        taken = await self._client.set(
+            self._prefix + key, token, nx=True, px=max(1, int(ttl * 1000))
+        )
+        return token if taken else None
+
+    async def release(self, key: str, token: str) -> None:
+        await self._client.eval(self._release_script, 1, self._prefix + key, token)
+
+
+def create_fetch_lease(
+    backend: Backend, lease_dir: Optional[str] = None, redis_client: Any = None
+) -> Optional[FetchLease]:
+    """Pick the fetch lease for a cache backend, None when a lease can't help.
+
+    Waiting workers read the holder's entry from the cache, so a lease is only
+    useful when all workers share the backend. The in-memory backend is per
+    worker process, a waiter would poll its own empty store and then call
+    upstream anyway.
+    """
+    if isinstance(backend, InMemoryBackend):
+        if lease_dir or redis_client is not None:
+            _log.warning(
+                "Fetch lease disabled: the in-memory cache backend is not shared "
+                "between workers, so waiting workers could never read the entry "
+                "written by the lease holder"
+            )
+        return None
+    if redis_client is not None:
+        return RedisLease(redis_client)
+    if lease_dir:
+        return FileLease(lease_dir)
+    return None
+
+
+_fetch_lease: Optional[FetchLease] = None
+
+
+def init_fetch_lease(lease: Optional[FetchLease]) -> None:
+    global _fetch_lease
+    _fetch_lease = lease
+
+
+def get_fetch_lease() -> Optional[FetchLease]:
+    return _fetch_lease
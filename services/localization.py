@@ -0,0 +1,186 @@
+"""Weather localization module.
+
+Unit and language variants are computed from the canonical metric English
+record, so they never cost an extra upstream call or cache entry.
+"""
+
+import re
+
+from constants import Language, Units
+
+_temperature_pattern = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*(°?)C\s*$")
+
+_condition_translations: dict[Language, dict[str, str]] = {
+    Language.UKRAINIAN: {
+        "clear": "Ясно",
+        "sunny": "Сонячно",
+        "partly cloudy": "Мінлива хмарність",
+        "cloudy": "Хмарно",
+        "overcast": "Похмуро",
+        "mist": "Серпанок",
+        "fog": "Туман",
+        "freezing fog": "Крижаний туман",
+        "haze": "Імла",
+        "patchy rain possible": "Місцями можливий дощ",
+        "patchy rain nearby": "Місцями дощ поблизу",
+        "patchy light rain": "Місцями невеликий дощ",
+        "light drizzle": "Легка мряка",
+        "drizzle": "Мряка",
+        "light rain": "Невеликий дощ",
+        "light rain shower": "Невелика злива",
+        "rain": "Дощ",
+        "moderate rain": "Помірний дощ",
+        "heavy rain": "Сильний дощ",
+        "moderate or heavy rain shower": "Помірна або сильна злива",
+        "light sleet": "Невеликий мокрий сніг",
+        "light snow": "Невеликий сніг",
+        "light snow showers": "Невеликий снігопад",
+        "snow": "Сніг",
+        "moderate snow": "Помірний сніг",
+        "heavy snow": "Сильний сніг",
+        "blizzard": "Хуртовина",
+        "thundery outbreaks possible": "Можлива гроза",
+        "thunderstorm": "Гроза",
+    },
+    Language.GERMAN: {
+        "clear": "Klar",
+        "sunny": "Sonnig",
+        "partly cloudy": "Teilweise bewölkt",
+        "cloudy": "Bewölkt",
+        "overcast": "Bedeckt",
+        "mist": "Dunst",
+        "fog": "Nebel",
+        "freezing fog": "Gefrierender Nebel",
+        "haze": "Dunst",
+        "patchy rain possible": "Stellenweise Regen möglich",
+        "patchy rain nearby": "Stellenweise Regen in der Nähe",
+        "patchy light rain": "Stellenweise leichter Regen",
+        "light drizzle": "Leichter Nieselregen",
+        "drizzle": "Nieselregen",
+        "light rain": "Leichter Regen",
+        "light rain shower": "Leichter Regenschauer",
+        "rain": "Regen",
+        "moderate rain": "Mäßiger Regen",
+        "heavy rain": "Starker Regen",
+        "moderate or heavy rain shower": "Mäßiger bis starker Regenschauer",
+        "light sleet": "Leichter Schneeregen",
+        "light snow": "Leichter Schneefall",
+        "light snow showers": "Leichte Schneeschauer",
+        "snow": "Schnee",
+        "moderate snow": "Mäßiger Schneefall",
+        "heavy snow": "Starker Schneefall",
+        "blizzard": "Schneesturm",
+        "thundery outbreaks possible": "Gewitter möglich",
+        "thunderstorm": "Gewitter",
+    },
+    Language.FRENCH: {
+        "clear": "Dégagé",
+        "sunny": "Ensoleillé",
+        "partly cloudy": "Partiellement nuageux",
+        "cloudy": "Nuageux",
+        "overcast": "Couvert",
+        "mist": "Brume",
+        "fog": "Brouillard",
+        "freezing fog": "Brouillard givrant",
+        "haze": "Brume sèche",
+        "patchy rain possible": "Pluie éparse possible",
+        "patchy rain nearby": "Pluie éparse à proximité",
+        "patchy light rain": "Pluie légère éparse",
+        "light drizzle": "Bruine légère",
+        "drizzle": "Bruine",
+        "light rain": "Pluie légère",
+        "light rain shower": "Averse de pluie légère",
+        "rain": "Pluie",
+        "moderate rain": "Pluie modérée",
+        "heavy rain": "Forte pluie",
+        "moderate or heavy rain shower": "Averse de pluie modérée ou forte",
+        "light sleet": "Légère neige fondue",
+        "light snow": "Neige légère",
+        "light snow showers": "Averses de neige légère",
+        "snow": "Neige",
+        "moderate snow": "Neige modérée",
+        "heavy snow": "Forte neige",
+        "blizzard": "Blizzard",
+        "thundery outbreaks possible": "Orages possibles",
+        "thunderstorm": "Orage",
+    },
+    Language.SPANISH: {
+        "clear": "Despejado",
+        "sunny": "Soleado",
+        "partly cloudy": "Parcialmente nublado",
+        "cloudy": "Nublado",
+        "overcast": "Cubierto",
+        "mist": "Neblina",
+        "fog": "Niebla",
+        "freezing fog": "Niebla helada",
+        "haze": "Calima",
+        "patchy rain possible": "Posible lluvia dispersa",
+        "patchy rain nearby": "Lluvia dispersa en las cercanías",
+        "patchy light rain": "Lluvia ligera dispersa",
+        "light drizzle": "Llovizna ligera",
+        "drizzle": "Llovizna",
+        "light rain": "Lluvia ligera",
+        "light rain shower": "Chubasco ligero",
+        "rain": "Lluvia",
+        "moderate rain": "Lluvia moderada",
+        "heavy rain": "Lluvia fuerte",
+        "moderate or heavy rain shower": "Chubasco moderado o fuerte",
+        "light sleet": "Aguanieve ligera",
+        "light snow": "Nevada ligera",
+        "light snow showers": "Chubascos de nieve ligeros",
+        "snow": "Nieve",
+        "moderate snow": "Nevada moderada",
+        "heavy snow": "Nevada fuerte",
+        "blizzard": "Ventisca",
+        "thundery outbreaks possible": "Posibles tormentas",
+        "thunderstorm": "Tormenta",
+    },
+}
+
+
+def celsius_to_fahrenheit(celsius: float) -> int:
+    return round(celsius * 9 / 5 + 32)
+
+
+def kmph_to_mph(speed: float) -> int:
+    return round(speed / 1.609344)
+
+
+def mm_to_inches(length: float) -> float:
+    return round(length / 25.4, 2)
+
+
+def convert_temperature(temperature: str, units: Units) -> str:
+    """Convert a wttr.in Celsius reading such as ``+25°C`` to the given units."""
+    if units == Units.METRIC:
+        return temperature
+    match_data = _temperature_pattern.match(temperature)
+    if not match_data:
+        return temperature
+    celsius, degree = match_data.groups()
+    fahrenheit = celsius_to_fahrenheit(float(celsius))
+    return f"{fahrenheit:+d}{degree}F"
+
+
+def translate_condition(condition: str, lang: Language) -> str:
+    """Translate a wttr.in condition, keeping unknown parts in English."""
+    translations = _condition_translations.get(lang)
+    if not translations:
+        return condition
+    parts = condition.split(",")
+    return ", ".join(
+        translations.get(part.strip().lower(), part.strip()) for part in parts
+    )
+
+
+def localize_weather(response: dict, units: Units, lang: Language) -> dict:
+    if units == Units.METRIC and lang == Language.ENGLISH:
+        return response
+    localized = dict(response)
+    localized["weather condition"] = translate_condition(
+        response["weather condition"], lang
+    )
+    localized["actual temperature"] = convert_temperature(
+        response["actual temperature"], units
+    )
+    return localized
@@ -0,0 +1,269 @@
+"""Upstream weather provider module.
+
+A provider returns the canonical metric English records that get cached: the
+short ``current`` record of ``WeatherService.get_weather`` and the compact
+rich record of ``services.forecast``. Caching and routes never depend on
+which provider produced them.
+"""
+
+import abc
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+import httpx
+
+from constants import (PROVIDER_COOLDOWN, PROVIDER_LATENCY_SMOOTHING,
+                       PROVIDER_MAX_FAILURES, HTTPResponseCode)
+from exceptions import UpstreamUnavailableError, WeatherServiceError
+from services.forecast import parse_j1
+
+
+class WeatherProvider(abc.ABC):
+    name: str
+
+    @abc.abstractmethod
+    async def fetch_current(self, city: str) -> dict:
+        """Return ``{"city", "weather condition", "actual temperature"}``."""
+
+    @abc.abstractmethod
+    async def fetch_rich(self, city: str) -> dict:
+        """Return the compact record built by ``services.forecast.parse_j1``."""
+
+
+class WttrProvider(WeatherProvider):
+    name = "wttr"
+    # Matches "<condition>,<temperature>" after the "<city>:" prefix.
+    _response_pattern = re.compile(r"(.+),(.+)$")
+
+    def __init__(self, base_url: str = "https://wttr.in"):
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._base_url = base_url
+
+    def _query_url(self, city: str) -> str:
+        return f"{self._base_url}/{city}?format=%l:%C,%t&m&lang=en"
+
+    def _rich_query_url(self, city: str) -> str:
+        return f"{self._base_url}/{city}?format=j1&lang=en"
+
+    async def fetch_current(self, city: str) -> dict:
+        response = await self._fetch(city, self._query_url(city))
+        return self._parse_weather_response(city, response)
+
+    async def fetch_rich(self, city: str) -> dict:
+        response = await self._fetch(city, self._rich_query_url(city))
+        return parse_j1(city, response)
+
+    async def _fetch(self, city: str, url: str) -> str:
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(url)
+            except httpx.RequestError as err:
+                self._log.error(
+                    "Fail to get a weather response for city %s: %s", city, err
+                )
+                raise UpstreamUnavailableError(
+                    message=f"Fail to get a response for {city}",
+                    status_code=HTTPResponseCode.BAD_GATEWAY.value,
+                )
+            if response.status_code != HTTPResponseCode.STATUS_OK.value:
+                self._log.warning(
+                    "Fail to get a weather response for city %s: %s %s",
+                    city,
+                    response.status_code,
+                    response.text,
+                )
+                # Only server errors say the provider itself is failing.
+                error_class = (
+                    UpstreamUnavailableError
+                    if response.status_code >= 500
+                    else WeatherServiceError
+                )
+                raise error_class(
+                    message=f"Fail to get a response for {city}",
+                    status_code=HTTPResponseCode.BAD_GATEWAY.value,
+                )
+            return response.text
+
+    def _parse_weather_response(self, city: str, response: str) -> dict:
+        prefix = f"{city}:"
+        match_data = None
+        if response.startswith(prefix):
+            match_data = self._response_pattern.match(response, len(prefix))
+        if not match_data:
+            raise WeatherServiceError(
+                message=f"Fail to parse weather response for {city}",
+                status_code=HTTPResponseCode.INTERNAL_SERVER_ERROR.value,
+            )
+        condition, temperature = match_data.groups()
+        parsed_response = {
+            "city": city,
+            "weather condition": condition,
+            "actual temperature": temperature,
+        }
+        return parsed_response
+
+
+class FixtureProvider(WeatherProvider):
+    """Local provider serving stored wttr.in j1 payloads, for tests and benchmarks.
+
+    Both records are derived from the j1 payload of the city, so one fixture
+    file per city is enough.
+    """
+
+    name = "fixture"
+
+    def __init__(self, payloads: dict[str, str]):
+        self._payloads = {city.lower(): payload for city, payload in payloads.items()}
+
+    @classmethod
+    def from_directory(cls, directory: str) -> "FixtureProvider":
+        """Load ``<city>.json`` j1 payloads from a directory."""
+        payloads = {}
+        for file_name in os.listdir(directory):
+            city, extension = os.path.splitext(file_name)
+            if extension == ".json":
+                with open(os.path.join(directory, file_name)) as fixture:
+                    payloads[city] = fixture.read()
+        return cls(payloads)
+
+    async def fetch_current(self, city: str) -> dict:
+        current = (await self.fetch_rich(city))["current"]
+        return {
+            "city": city,
+            "weather condition": current["condition"],
+            "actual temperature": f"{current['temperature']:+d}°C",
+        }
+
+    async def fetch_rich(self, city: str) -> dict:
+        payload = self._payloads.get(city)
+        if payload is None:
+            raise WeatherServiceError(
+                message=f"Fail to get a response for {city}",
+                status_code=HTTPResponseCode.BAD_GATEWAY.value,
+            )
+        return parse_j1(city, payload)
+
+
+class ProviderHealth:
+    """Smoothed latency and failure streak of one provider."""
+
+    __slots__ = ("latency", "failures", "unhealthy_until")
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.unhealthy_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def record_success(self, latency: float) -> None:
+        self.failures = 0
+        self.unhealthy_until = 0.0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += PROVIDER_LATENCY_SMOOTHING * (latency - self.latency)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= PROVIDER_MAX_FAILURES:
+            self.unhealthy_until = time.monotonic() + PROVIDER_COOLDOWN
+
+
+class ProviderChain(WeatherProvider):
+    """Failover between providers.
+
+    With the ``ordered`` strategy healthy providers are tried in the configured
+    order, with ``fastest`` by their smoothed latency. A provider that fails
+    PROVIDER_MAX_FAILURES times in a row is skipped for PROVIDER_COOLDOWN
+    seconds, unless no healthy provider is left. Only transport errors,
+    timeouts and server errors (UpstreamUnavailableError) count as failures;
+    other errors, such as an unknown city or an unparsable payload, fail over
+    without penalizing the provider.
+    """
+
+    name = "chain"
+    strategies = ("ordered", "fastest")
+
+    def __init__(self, providers: list[WeatherProvider], strategy: str = "ordered"):
+        if not providers:
+            raise ValueError("At least one weather provider is required")
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown provider strategy {strategy}")
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._providers = providers
+        self._strategy = strategy
+        self._health = {provider: ProviderHealth() for provider in providers}
+
+    @property
+    def health(self) -> dict[str, ProviderHealth]:
+        return {provider.name: self._health[provider] for provider in self._providers}
+
+    def _candidates(self) -> list[WeatherProvider]:
+        healthy = [p for p in self._providers if self._health[p].healthy]
+        if self._strategy == "fastest":
+            # Providers without a measurement yet go first to get one.
+            healthy.sort(key=lambda p: self._health[p].latency or 0.0)
+        unhealthy = [p for p in self._providers if p not in healthy]
+        return healthy + unhealthy
+
+    async def _call(self, method: str, city: str) -> dict:
+        last_error = None
+        for provider in self._candidates():
+            health = self._health[provider]
+            started = time.perf_counter()
+            try:
+                result = await getattr(provider, method)(city)
+            except WeatherServiceError as err:
+                if isinstance(err, UpstreamUnavailableError):
+                    health.record_failure()
+                self._log.warning(
+                    "Provider %s failed for city %s: %s", provider.name, city, err
+                )
+                last_error = err
+                continue
+            health.record_success(time.perf_counter() - started)
+            return result
+        raise last_error
+
+    async def fetch_current(self, city: str) -> dict:
+        return await self._call("fetch_current", city)
+
+    async def fetch_rich(self, city: str) -> dict:
+        return await self._call("fetch_rich", city)
+
+
+def create_provider(
+    names: list[str], strategy: str = "ordered", fixture_dir: Optional[str] = None
+) -> WeatherProvider:
+    """Build a provider from configured names, chaining them if more than one."""
+    providers = []
+    for name in names:
+        if name == WttrProvider.name:
+            providers.append(WttrProvider())
+        elif name == FixtureProvider.name:
+            if not fixture_dir:
+                raise ValueError("The fixture provider needs a fixture directory")
+            providers.append(FixtureProvider.from_directory(fixture_dir))
+        else:
+            raise ValueError(f"Unknown weather provider {name}")
+    if len(providers) == 1:
+        return providers[0]
+    return ProviderChain(providers, strategy)
+
+
+_weather_provider: WeatherProvider = WttrProvider()
+
+
+def init_weather_provider(provider: WeatherProvider) -> None:
+    global _weather_provider
+    _weather_provider = provider
+
+
+def get_weather_provider() -> WeatherProvider:
+    return _weather_provider
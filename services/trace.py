@@ -0,0 +1,61 @@
+"""Cache access trace module.
+
+When enabled, the cache decorator appends one JSON line per cached call to a
+trace file that ``tools/simulate_cache.py`` can replay offline.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+
+class TraceRecorder:
+    """Append-only JSONL writer, safe to share between worker processes.
+
+    Each record goes out in a single write to a file opened with O_APPEND, so
+    lines from different workers never interleave.
+    """
+
+    def __init__(self, path: str):
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._pid = os.getpid()
+
+    def record(
+        self,
+        key: str,
+        ttl: int,
+        bypass: bool,
+        hit: bool,
+        latency: Optional[float],
+        error: bool = False,
+    ) -> None:
+        line = json.dumps(
+            {
+                "ts": round(time.time(), 3),
+                "key": key,
+                "ttl": ttl,
+                "bypass": bypass,
+                "hit": hit,
+                "latency": None if latency is None else round(latency, 4),
+                "error": error,
+                "pid": self._pid,
+            },
+            separators=(",", ":"),
+        )
+        os.write(self._fd, (line + "\n").encode())
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+_trace_recorder: Optional[TraceRecorder] = None
+
+
+def init_trace_recorder(recorder: Optional[TraceRecorder]) -> None:
+    global _trace_recorder
+    _trace_recorder = recorder
+
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    return _trace_recorder
@@ -1,64 +1,75 @@
 """Weather service module."""
 
-import logging
-import re
+import asyncio
+from typing import AsyncIterator
 
-import httpx
 from fastapi import Request
 
-from constants import HTTPResponseCode
 from exceptions import WeatherServiceError
 from services.cache import CacheService, cache
-from validation.weather import WeatherRequest
+from services.forecast import project_view
+from services.localization import localize_weather
+from services.providers import get_weather_provider
+from validation.weather import WeatherBatchRequest, WeatherRequest
 
 
 class WeatherService(CacheService):
+    __slots__ = ("_city", "_units", "_lang")
 
     def __init__(self, weather_request: WeatherRequest, request: Request):
-        self._log = logging.getLogger(self.__class__.__name__)
         self._city = weather_request.city
-        self._response_pattern = re.compile(f"^{self._city}:(.+),(.+)$")
-        self._query_url = f"https://wttr.in/{self._city}?format=%l:%C,%t"
+        self._units = weather_request.units
+        self._lang = weather_request.lang
         super().__init__(weather_request, request)
 
-    @cache("city")
-    async def get_weather(self) -> dict:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(self._query_url)
-            except httpx.RequestError as err:
-                self._log.error(
-                    "Fail to get a weather response for city %s: %s", self._city, err
-                )
-                raise WeatherServiceError(
-                    message=f"Fail to get a response for {self._city}",
-                    status_code=HTTPResponseCode.BAD_GATEWAY.value,
-                )
-            if response.status_code != HTTPResponseCode.STATUS_OK.value:
-                self._log.warning(
-                    "Fail to get a weather response for city %s: %s %s",
-                    self._city,
-                    response.status_code,
-                    response.text,
-                )
-                raise WeatherServiceError(
-                    message=f"Fail to get a response for {self._city}",
-                    status_code=HTTPResponseCode.BAD_GATEWAY.value,
-                )
-            parsed_response = self._parse_weather_response(response.text)
-            return parsed_response
+    async def get_weather(self) -> tuple[int, bool, dict]:
+        cache_ttl, cache_hit, response = await self._get_canonical_weather()
+        return cache_ttl, cache_hit, localize_weather(response, self._units, self._lang)
 
-    def _parse_weather_response(self, response: str) -> dict:
-        match_data = re.findall(self._response_pattern, response)
-        if not match_data:
-            raise WeatherServiceError(
-                message=f"Fail to parse weather response for {self._city}",
-                status_code=HTTPResponseCode.INTERNAL_SERVER_ERROR.value,
-            )
-        condition, temperature = match_data[0]
-        parsed_response = {
-            "city": self._city,
-            "weather condition": condition,
-            "actual temperature": temperature,
-        }
-        return parsed_response
+    async def get_view(self, view: str) -> tuple[int, bool, dict]:
+        """Return one of the rich forecast views built from the cached j1 record."""
+        cache_ttl, cache_hit, record = await self._get_rich_weather()
+        return cache_ttl, cache_hit, project_view(record, view, self._units, self._lang)
+
+    @cache("city", namespace="current:")
+    async def _get_canonical_weather(self) -> dict:
+        return await get_weather_provider().fetch_current(self._city)
+
+    @cache("city", namespace="j1:")
+    async def _get_rich_weather(self) -> dict:
+        return await get_weather_provider().fetch_rich(self._city)
+
+
+async def _get_city_weather(weather_request: WeatherRequest, request: Request) -> dict:
+    try:
+        cache_ttl, cache_hit, response = await WeatherService(
+            weather_request, request
+        ).get_weather()
+    except WeatherServiceError as err:
+        return {"city": weather_request.city, "error": err.message}
+    return {
+        "city": weather_request.city,
+        "cache_status": "HIT" if cache_hit else "MISS",
+        "cache_ttl": cache_ttl,
+        "data": response,
+    }
+
+
+async def iter_weather_batch(
+    batch_request: WeatherBatchRequest, request: Request
+) -> AsyncIterator[dict]:
+    """Resolve cities concurrently and yield each result as soon as it is ready.
+
+    A city failing upstream yields an ``error`` entry instead of failing the
+    batch. Cache headers must be validated before, once for the whole batch.
+    """
+    tasks = [
+        asyncio.create_task(_get_city_weather(weather_request, request))
+        for weather_request in batch_request.city_requests()
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
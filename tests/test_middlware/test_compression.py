@@ -0,0 +1,152 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, StreamingResponse
+
+from middlware import compression
+from middlware.compression import CompressionMiddleware, select_encoding
+
+LARGE = {"data": "x" * 2000}
+
+app = FastAPI()
+
+
+@app.get("/cached")
+async def cached():
+    return JSONResponse(LARGE, headers={"X-Cache-Status": "HIT"})
+
+
+@app.get("/cookies")
+async def cookies():
+    response = JSONResponse(LARGE, headers={"Vary": "Cookie"})
+    response.set_cookie("first", "1")
+    response.set_cookie("second", "2")
+    return response
+
+
+@app.get("/miss")
+async def miss():
+    return JSONResponse(LARGE, headers={"X-Cache-Status": "MISS"})
+
+
+@app.get("/plain")
+async def plain():
+    return JSONResponse(LARGE)
+
+
+@app.get("/small")
+async def small():
+    return JSONResponse({"data": "x"}, headers={"X-Cache-Status": "HIT"})
+
+
+@app.get("/stream")
+async def stream():
+    async def lines():
+        yield b'{"a": 1}\n'
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+app.add_middleware(CompressionMiddleware)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+        ("gzip;q=abc", None),
+    ],
+)
+def test_select_encoding(header, expected):
+    assert select_encoding(header) == expected
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress", [("gzip", gzip.decompress), ("br", brotli.decompress)]
+)
+def test_large_body_is_compressed(encoding, decompress):
+    client = TestClient(app)
+    with client.stream("GET", "/plain", headers={"Accept-Encoding": encoding}) as raw:
+        body = b"".join(raw.iter_raw())
+        assert raw.headers["Content-Encoding"] == encoding
+        assert raw.headers["Vary"] == "Accept-Encoding"
+        assert int(raw.headers["Content-Length"]) == len(body)
+    assert decompress(body) == b'{"data":"' + b"x" * 2000 + b'"}'
+
+
+def test_no_accept_encoding_is_not_compressed():
+    client = TestClient(app)
+    response = client.get("/plain", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.json() == LARGE
+
+
+def test_small_body_is_not_compressed():
+    client = TestClient(app)
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.json() == {"data": "x"}
+
+
+def test_stream_is_passed_through():
+    client = TestClient(app)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.text == '{"a": 1}\n'
+
+
+def test_cached_body_is_compressed_once(monkeypatch):
+    calls = []
+    gzip_encoder = compression._encoders["gzip"]
+
+    def counting_encoder(body):
+        calls.append(len(body))
+        return gzip_encoder(body)
+
+    monkeypatch.setitem(compression._encoders, "gzip", counting_encoder)
+    client = TestClient(app)
+    for _ in range(3):
+        response = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        assert response.json() == LARGE
+    assert len(calls) == 1
+    for path in ("/plain", "/plain", "/miss", "/miss"):
+        client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert len(calls) == 5
+
+
+def test_compressed_bodies_are_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(compression, "COMPRESSED_BODIES_MAX_BYTES", 10)
+    monkeypatch.setitem(compression._encoders, "gzip", lambda body: body[:4])
+    middleware = CompressionMiddleware(app=None)
+    for body in (b"aaaa-1", b"bbbb-2", b"cccc-3"):
+        assert middleware._compress_cached("gzip", body) == body[:4]
+    assert middleware._compressed_bytes == 8
+    assert [value for value in middleware._compressed_bodies.values()] == [
+        b"bbbb",
+        b"cccc",
+    ]
+    assert all(len(digest) == 16 for _, digest in middleware._compressed_bodies)
+    assert middleware._compress_cached("gzip", b"x" * 20) == b"xxxx"
+    monkeypatch.setitem(compression._encoders, "gzip", lambda body: body * 3)
+    assert middleware._compress_cached("gzip", b"abcd") == b"abcd" * 3
+    assert middleware._compressed_bytes <= 10
+
+
+def test_repeated_headers_are_kept():
+    client = TestClient(app)
+    response = client.get("/cookies", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers.get_list("set-cookie") == [
+        "first=1; Path=/; SameSite=lax",
+        "second=2; Path=/; SameSite=lax",
+    ]
+    assert response.headers["Vary"] == "Cookie, Accept-Encoding"
+    assert response.json() == LARGE
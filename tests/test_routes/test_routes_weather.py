@@ -1,10 +1,14 @@
+import json
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from exceptions import WeatherServiceError
+from middlware.error_handler import ErrorHandlerMiddleware
 from routes.weather import weather_router
 from services.cache import FastAPICache
-from services.weather import WeatherService, WeatherServiceError
+from services.weather import WeatherService
 
 app = FastAPI()
 app.include_router(weather_router)
@@ -75,3 +79,95 @@ def test_get_weather_service_error(monkeypatch):
     client = TestClient(app, raise_server_exceptions=False)
     response = client.post("/weather/", json={"city": "ErrCity"})
     assert response.status_code == 500
+
+
+@pytest.mark.parametrize("view", ["current", "hourly", "forecast"])
+def test_get_weather_views(monkeypatch, view):
+    async def fake_get_view(self, requested_view):
+        return 3, False, {"city": "kyiv", "view": requested_view}
+
+    monkeypatch.setattr(WeatherService, "get_view", fake_get_view)
+
+    client = TestClient(app)
+    response = client.post(f"/weather/{view}", json={"city": "Kyiv"})
+    assert response.status_code == 200
+    assert response.json() == {"city": "kyiv", "view": view}
+    assert response.headers.get("X-Cache-Status") == "MISS"
+    assert response.headers.get("X-Cache-TTL") == "3"
+
+
+def _fake_batch_get_weather(monkeypatch):
+    async def fake_get(self):
+        if self._city == "err":
+            raise WeatherServiceError(message="fail", status_code=502)
+        return 5 if self._city == "a" else 9, self._city == "a", {"city": self._city}
+
+    monkeypatch.setattr(WeatherService, "get_weather", fake_get)
+
+
+def test_get_weather_batch_json(monkeypatch):
+    _fake_batch_get_weather(monkeypatch)
+    client = TestClient(app)
+    response = client.post("/weather/batch", json={"cities": ["B", "a", "err", "b"]})
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {
+                "city": "b",
+                "cache_status": "MISS",
+                "cache_ttl": 9,
+                "data": {"city": "b"},
+            },
+            {"city": "a", "cache_status": "HIT", "cache_ttl": 5, "data": {"city": "a"}},
+            {"city": "err", "error": "fail"},
+        ]
+    }
+    assert response.headers.get("X-Cache-Status") == "MISS"
+    assert response.headers.get("X-Cache-TTL") == "5"
+
+
+def test_get_weather_batch_all_hits(monkeypatch):
+    _fake_batch_get_weather(monkeypatch)
+    client = TestClient(app)
+    response = client.post("/weather/batch", json={"cities": ["a"]})
+    assert response.headers.get("X-Cache-Status") == "HIT"
+
+
+def test_get_weather_batch_ndjson(monkeypatch):
+    _fake_batch_get_weather(monkeypatch)
+    client = TestClient(app)
+    response = client.post(
+        "/weather/batch",
+        json={"cities": ["a", "b", "err"]},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["city"] for line in lines) == ["a", "b", "err"]
+
+
+@pytest.mark.parametrize("payload", [{}, {"cities": []}, {"cities": ["x"] * 51}])
+def test_get_weather_batch_bad_input(payload):
+    client = TestClient(app)
+    response = client.post("/weather/batch", json=payload)
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "headers", [{"X-Cache-TTL": "abc"}, {"X-Cache-Bypass": "maybe"}]
+)
+@pytest.mark.parametrize("accept", ["application/json", "application/x-ndjson"])
+def test_get_weather_batch_bad_cache_headers(monkeypatch, headers, accept):
+    _fake_batch_get_weather(monkeypatch)
+    error_app = FastAPI()
+    error_app.include_router(weather_router)
+    error_app.add_middleware(ErrorHandlerMiddleware)
+    client = TestClient(error_app)
+    response = client.post(
+        "/weather/batch",
+        json={"cities": ["a", "b"]},
+        headers={"Accept": accept, **headers},
+    )
+    assert response.status_code == 400
+    assert "error" in response.json()
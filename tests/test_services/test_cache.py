@@ -3,6 +3,10 @@ import logging
 
 import pytest
 
+from exceptions import WeatherServiceError
+from services import cache as cache_module
+from services import lease as lease_module
+from services import trace as trace_module
 from services.cache import (DEFAULT_CACHE_TTL, MAX_CACHE_TTL, CacheService,
                             CacheServiceError, FastAPICache, HTTPResponseCode,
                             cache)
@@ -24,12 +28,13 @@ class DummyCacheRequest:
 class FakeBackend:
     def __init__(self):
         self.store = {}
+        self.ttls = {}
         self.get_calls = []
         self.set_calls = []
 
     async def get_with_ttl(self, key):
         self.get_calls.append(key)
-        return 0, self.store.get(key)
+        return self.ttls.get(key, 0), self.store.get(key)
 
     async def set(self, key, value, expire):
         self.set_calls.append((key, value, expire))
@@ -47,6 +52,30 @@ def patch_backend(monkeypatch):
     return backend
 
 
+@pytest.fixture(autouse=True)
+def reset_fetch_costs(monkeypatch):
+    monkeypatch.setattr(cache_module, "_fetch_costs", {})
+
+
+class FakeLease:
+    def __init__(self, held=False):
+        self.held = held
+        self.released = []
+
+    async def acquire(self, key, ttl):
+        return None if self.held else "token"
+
+    async def release(self, key, token):
+        self.released.append((key, token))
+
+
+@pytest.fixture
+def fake_lease(monkeypatch):
+    lease = FakeLease()
+    monkeypatch.setattr(lease_module, "_fetch_lease", lease)
+    return lease
+
+
 # Tests for header parsing
 @pytest.mark.parametrize(
     "value, expected",
@@ -129,6 +158,12 @@ class TestService(CacheService):
         return {"value": value}
 
 
+class FailingService(CacheService):
+    @cache("key")
+    async def get_data(self):
+        raise WeatherServiceError(message="upstream down", status_code=502)
+
+
 @pytest.mark.asyncio
 async def test_cache_decorator_bypass(patch_backend):
     cache_request = DummyCacheRequest(key="k1", cache_ttl=10, cache_bypass=True)
@@ -140,6 +175,23 @@ async def test_cache_decorator_bypass(patch_backend):
     assert patch_backend.set_calls == []
 
 
+def test_init_backend_is_looked_up_lazily(monkeypatch):
+    calls = []
+    backend = FakeBackend()
+
+    def get_backend(self):
+        calls.append(1)
+        return backend
+
+    monkeypatch.setattr(FastAPICache, "get_backend", get_backend)
+    cache_request = DummyCacheRequest(cache_ttl=None, cache_bypass=False)
+    service = CacheService(cache_request, DummyRequest())
+    assert calls == []
+    assert service.cache_backend is backend
+    assert service.cache_backend is backend
+    assert calls == [1]
+
+
 @pytest.mark.asyncio
 async def test_cache_decorator_missing_key(patch_backend):
     cache_request = DummyCacheRequest(other="x", cache_ttl=5, cache_bypass=False)
@@ -178,3 +230,171 @@ async def test_cache_decorator_miss_then_set(patch_backend):
     assert key == "k3"
     assert json.loads(raw.decode()) == {"value": 123}
     assert expire == 7
+
+
+@pytest.mark.parametrize("ttl", [1, 60, DEFAULT_CACHE_TTL, MAX_CACHE_TTL])
+def test_jittered_ttl_bounds(ttl):
+    for _ in range(100):
+        expire = cache_module._jittered_ttl(ttl, 0.1)
+        assert ttl - int(ttl * 0.1) <= expire <= ttl
+        assert expire >= 1
+
+
+def test_jittered_ttl_disabled():
+    assert cache_module._jittered_ttl(DEFAULT_CACHE_TTL, 0) == DEFAULT_CACHE_TTL
+
+
+def test_should_refresh_early_without_known_cost():
+    assert cache_module._should_refresh_early("unknown", 1, 1.0) is False
+
+
+def test_should_refresh_early_near_expiry(monkeypatch):
+    monkeypatch.setattr(cache_module, "_fetch_costs", {"k": 2.0})
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+    # -2.0 * ln(0.5) ~= 1.39 seconds of early recomputation budget
+    assert cache_module._should_refresh_early("k", 1, 1.0) is True
+    assert cache_module._should_refresh_early("k", 2, 1.0) is False
+    assert cache_module._should_refresh_early("k", 1, 0) is False
+
+
+def test_remember_fetch_cost_is_bounded(monkeypatch):
+    monkeypatch.setattr(cache_module, "FETCH_COST_MAX_KEYS", 2)
+    for key in ("a", "b", "c"):
+        cache_module._remember_fetch_cost(key, 1.0)
+    assert list(cache_module._fetch_costs) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_early_refresh(monkeypatch, patch_backend):
+    monkeypatch.setattr(cache_module, "_fetch_costs", {"k4": 10.0})
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+    monkeypatch.setattr(TestService, "cache_ttl_jitter", 0)
+    backend = patch_backend
+    backend.store["k4"] = json.dumps({"value": "stale"}).encode()
+    backend.ttls["k4"] = 1
+    cache_request = DummyCacheRequest(key="k4", cache_ttl=9, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    result = await service.get_data("fresh")
+    assert result == (0, False, {"value": "fresh"})
+    assert backend.set_calls[0][2] == 9
+    assert cache_module._fetch_costs["k4"] < 10.0
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_failed_early_refresh_serves_cached(
+    monkeypatch, patch_backend
+):
+    monkeypatch.setattr(cache_module, "_fetch_costs", {"k11": 10.0})
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+    patch_backend.store["k11"] = json.dumps({"value": "stale"}).encode()
+    patch_backend.ttls["k11"] = 2
+    cache_request = DummyCacheRequest(key="k11", cache_ttl=9, cache_bypass=False)
+    service = FailingService(cache_request, DummyRequest(headers={}))
+    assert await service.get_data() == (2, True, {"value": "stale"})
+    assert patch_backend.set_calls == []
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_failed_fetch_without_entry_raises(patch_backend):
+    cache_request = DummyCacheRequest(key="k12", cache_ttl=9, cache_bypass=False)
+    service = FailingService(cache_request, DummyRequest(headers={}))
+    with pytest.raises(WeatherServiceError):
+        await service.get_data()
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_lease_holder_fetches(patch_backend, fake_lease):
+    cache_request = DummyCacheRequest(key="k5", cache_ttl=5, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    result = await service.get_data(5)
+    assert result == (0, False, {"value": 5})
+    assert patch_backend.get_calls == ["k5", "k5"]
+    assert len(patch_backend.set_calls) == 1
+    assert fake_lease.released == [("k5", "token")]
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_lease_waiter_reads_entry(
+    monkeypatch, patch_backend, fake_lease
+):
+    fake_lease.held = True
+    backend = patch_backend
+
+    async def holder_writes(_):
+        backend.store["k6"] = json.dumps({"value": "holder"}).encode()
+
+    monkeypatch.setattr(cache_module.asyncio, "sleep", holder_writes)
+    cache_request = DummyCacheRequest(key="k6", cache_ttl=5, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    result = await service.get_data("waiter")
+    assert result == (0, True, {"value": "holder"})
+    assert backend.set_calls == []
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_lease_wait_timeout(
+    monkeypatch, patch_backend, fake_lease
+):
+    fake_lease.held = True
+    monkeypatch.setattr(cache_module, "FETCH_LEASE_WAIT", 0)
+    cache_request = DummyCacheRequest(key="k7", cache_ttl=5, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    result = await service.get_data(7)
+    assert result == (0, False, {"value": 7})
+    assert len(patch_backend.set_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_lease_held_serves_stale_on_early_refresh(
+    monkeypatch, patch_backend, fake_lease
+):
+    fake_lease.held = True
+    monkeypatch.setattr(cache_module, "_fetch_costs", {"k8": 10.0})
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+    patch_backend.store["k8"] = json.dumps({"value": "stale"}).encode()
+    patch_backend.ttls["k8"] = 1
+    cache_request = DummyCacheRequest(key="k8", cache_ttl=5, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    result = await service.get_data("fresh")
+    assert result == (1, True, {"value": "stale"})
+    assert patch_backend.set_calls == []
+
+
+class FakeRecorder:
+    def __init__(self):
+        self.records = []
+
+    def record(self, key, ttl, bypass, hit, latency, error=False):
+        self.records.append((key, ttl, bypass, hit, latency, error))
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_records_trace(monkeypatch, patch_backend):
+    recorder = FakeRecorder()
+    monkeypatch.setattr(trace_module, "_trace_recorder", recorder)
+    cache_request = DummyCacheRequest(key="k9", cache_ttl=5, cache_bypass=False)
+    service = TestService(cache_request, DummyRequest(headers={}))
+    await service.get_data(1)
+    await service.get_data(1)
+    bypass_request = DummyCacheRequest(key="k9", cache_ttl=5, cache_bypass=True)
+    await TestService(bypass_request, DummyRequest(headers={})).get_data(1)
+    miss, hit, bypass = recorder.records
+    assert miss[:4] == ("k9", 5, False, False)
+    assert miss[4] >= 0
+    assert miss[5] is False
+    assert hit == ("k9", 5, False, True, None, False)
+    assert bypass[:4] == ("k9", 5, True, False)
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_traces_failed_miss(monkeypatch, patch_backend):
+    recorder = FakeRecorder()
+    monkeypatch.setattr(trace_module, "_trace_recorder", recorder)
+    cache_request = DummyCacheRequest(key="k10", cache_ttl=5, cache_bypass=False)
+    service = FailingService(cache_request, DummyRequest(headers={}))
+    with pytest.raises(WeatherServiceError):
+        await service.get_data()
+    (failed,) = recorder.records
+    assert failed[:4] == ("k10", 5, False, False)
+    assert failed[4] >= 0
+    assert failed[5] is True
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from constants import HTTPResponseCode, Language, Units
+from exceptions import WeatherServiceError
+from services.forecast import FORECAST_VIEWS, parse_j1, project_view
+
+
+def _hour(time, temp):
+    return {
+        "time": time,
+        "tempC": str(temp),
+        "FeelsLikeC": str(temp - 1),
+        "humidity": "70",
+        "windspeedKmph": "16",
+        "chanceofrain": "20",
+        "precipMM": "0.5",
+        "weatherDesc": [{"value": "Light rain"}],
+    }
+
+
+J1_PAYLOAD = json.dumps(
+    {
+        "current_condition": [
+            {
+                "temp_C": "20",
+                "FeelsLikeC": "19",
+                "humidity": "60",
+                "windspeedKmph": "8",
+                "winddir16Point": "SW",
+                "pressure": "1015",
+                "precipMM": "0.0",
+                "weatherDesc": [{"value": "Sunny "}],
+            }
+        ],
+        "nearest_area": [{"areaName": [{"value": "Kyiv"}]}],
+        "weather": [
+            {
+                "date": "2025-06-01",
+                "mintempC": "10",
+                "maxtempC": "25",
+                "avgtempC": "18",
+                "sunHour": "12.5",
+                "hourly": [_hour("0", 10), _hour("1200", 25)],
+            },
+            {
+                "date": "2025-06-02",
+                "mintempC": "0",
+                "maxtempC": "5",
+                "avgtempC": "3",
+                "sunHour": "4.0",
+                "hourly": [_hour("2100", 0)],
+            },
+        ],
+    }
+)
+
+
+def test_parse_j1_compact_record():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    assert record["city"] == "kyiv"
+    assert record["current"] == {
+        "condition": "Sunny",
+        "temperature": 20,
+        "feels_like": 19,
+        "humidity": 60,
+        "wind_speed": 8,
+        "wind_direction": "SW",
+        "pressure": 1015,
+        "precipitation": 0.0,
+    }
+    assert [day["date"] for day in record["days"]] == ["2025-06-01", "2025-06-02"]
+    assert [hour["time"] for hour in record["days"][0]["hourly"]] == [
+        "00:00",
+        "12:00",
+    ]
+    assert "nearest_area" not in record
+
+
+@pytest.mark.parametrize("payload", ["not json", "{}", '{"current_condition": []}'])
+def test_parse_j1_failure(payload):
+    with pytest.raises(WeatherServiceError) as excinfo:
+        parse_j1("kyiv", payload)
+    assert excinfo.value.status_code == HTTPResponseCode.INTERNAL_SERVER_ERROR.value
+
+
+def test_project_current_metric():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    view = project_view(record, "current", Units.METRIC, Language.ENGLISH)
+    assert view["units"] == "metric"
+    assert view["temperature"] == 20
+    assert view["condition"] == "Sunny"
+
+
+def test_project_current_imperial_translated():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    view = project_view(record, "current", Units.IMPERIAL, Language.UKRAINIAN)
+    assert view["units"] == "imperial"
+    assert view["temperature"] == 68
+    assert view["wind_speed"] == 5
+    assert view["condition"] == "Сонячно"
+    assert record["current"]["temperature"] == 20
+
+
+def test_project_hourly_flattens_days():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    view = project_view(record, "hourly", Units.METRIC, Language.ENGLISH)
+    assert [(hour["date"], hour["time"]) for hour in view["hourly"]] == [
+        ("2025-06-01", "00:00"),
+        ("2025-06-01", "12:00"),
+        ("2025-06-02", "21:00"),
+    ]
+
+
+def test_project_forecast_drops_hourly():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    view = project_view(record, "forecast", Units.IMPERIAL, Language.ENGLISH)
+    assert view["days"][1] == {
+        "date": "2025-06-02",
+        "min_temperature": 32,
+        "max_temperature": 41,
+        "avg_temperature": 37,
+        "sun_hours": 4.0,
+    }
+
+
+def test_project_unknown_view():
+    record = parse_j1("kyiv", J1_PAYLOAD)
+    assert "daily" not in FORECAST_VIEWS
+    with pytest.raises(WeatherServiceError) as excinfo:
+        project_view(record, "daily", Units.METRIC, Language.ENGLISH)
+    assert excinfo.value.status_code == HTTPResponseCode.BAD_REQUEST.value
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from constants import FETCH_LEASE_WAIT
+from services import lease as lease_module
+from services.cache import CacheService, cache
+from services.lease import FileLease, RedisLease, create_fetch_lease
+from validation.weather import WeatherRequest
+
+
+class DummyRequest:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+class FakeRedis:
+    """Local stand-in for the SET NX PX and compare-and-delete calls."""
+
+    def __init__(self):
+        self.store = {}
+        self.set_calls = []
+
+    async def set(self, name, value, nx=False, px=None):
+        self.set_calls.append((name, value, nx, px))
+        if nx and name in self.store:
+            return None
+        self.store[name] = value
+        return True
+
+    async def eval(self, script, numkeys, name, token):
+        if self.store.get(name) == token:
+            del self.store[name]
+            return 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_file_lease_single_holder(tmp_path):
+    first, second = FileLease(str(tmp_path)), FileLease(str(tmp_path))
+    token = await first.acquire("kyiv", 30)
+    assert token is not None
+    assert await second.acquire("kyiv", 30) is None
+    assert await second.acquire("lviv", 30) is not None
+    await first.release("kyiv", token)
+    assert await second.acquire("kyiv", 30) is not None
+
+
+@pytest.mark.asyncio
+async def test_file_lease_release_removes_lock_file(tmp_path):
+    lease = FileLease(str(tmp_path))
+    for city in ("kyiv", "lviv", "odesa"):
+        await lease.release(city, await lease.acquire(city, 30))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_file_lease_retries_on_unlinked_file(tmp_path, monkeypatch):
+    first, second = FileLease(str(tmp_path)), FileLease(str(tmp_path))
+    token = await first.acquire("kyiv", 30)
+    # Opened before the release, so it points at the file about to be unlinked.
+    stale_fd = os.open(first._path("kyiv"), os.O_RDWR)
+    await first.release("kyiv", token)
+    opened = []
+    real_open = os.open
+
+    def open_stale_first(*args, **kwargs):
+        opened.append(args[0])
+        return stale_fd if len(opened) == 1 else real_open(*args, **kwargs)
+
+    monkeypatch.setattr(lease_module.os, "open", open_stale_first)
+    token = await second.acquire("kyiv", 30)
+    monkeypatch.undo()
+    assert token is not None
+    assert len(opened) == 2
+    assert await first.acquire("kyiv", 30) is None
+    await second.release("kyiv", token)
+
+
+@pytest.mark.asyncio
+async def test_file_lease_release_unknown_token(tmp_path):
+    lease = FileLease(str(tmp_path))
+    await lease.release("kyiv", "unknown")
+
+
+@pytest.mark.asyncio
+async def test_redis_lease_set_nx_with_expiry():
+    client = FakeRedis()
+    lease = RedisLease(client)
+    token = await lease.acquire("kyiv", 1.5)
+    assert token is not None
+    assert client.set_calls[0] == ("lease:kyiv", token, True, 1500)
+    assert await lease.acquire("kyiv", 1.5) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_lease_release_only_by_owner():
+    client = FakeRedis()
+    lease = RedisLease(client)
+    token = await lease.acquire("kyiv", 30)
+    await lease.release("kyiv", "other")
+    assert "lease:kyiv" in client.store
+    await lease.release("kyiv", token)
+    assert client.store == {}
+
+
+class SharedStoreBackend:
+    """One worker's client of a cache store shared by all workers."""
+
+    def __init__(self, store):
+        self.store = store
+
+    async def get_with_ttl(self, key):
+        return (60, self.store[key]) if key in self.store else (0, None)
+
+    async def set(self, key, value, expire):
+        self.store[key] = value
+
+
+def test_create_fetch_lease_refuses_in_memory_backend(tmp_path, caplog):
+    lease = create_fetch_lease(InMemoryBackend(), str(tmp_path), FakeRedis())
+    assert lease is None
+    assert "not shared between workers" in caplog.text
+
+
+def test_create_fetch_lease_for_shared_backend(tmp_path):
+    backend = SharedStoreBackend({})
+    assert isinstance(create_fetch_lease(backend, str(tmp_path)), FileLease)
+    assert isinstance(create_fetch_lease(backend, None, FakeRedis()), RedisLease)
+    assert create_fetch_lease(backend) is None
+
+
+class UpstreamService(CacheService):
+    upstream_calls = 0
+
+    @cache("city")
+    async def get_weather(self):
+        UpstreamService.upstream_calls += 1
+        await asyncio.sleep(0.2)
+        return {"city": self.cache_request.city}
+
+
+@pytest.mark.asyncio
+async def test_lease_waiter_reads_holder_entry(monkeypatch, tmp_path):
+    monkeypatch.setattr(lease_module, "_fetch_lease", FileLease(str(tmp_path)))
+    monkeypatch.setattr(UpstreamService, "upstream_calls", 0)
+    store = {}
+    workers = []
+    for _ in range(2):
+        cache_request = WeatherRequest(city="Kyiv", cache_ttl=60)
+        service = UpstreamService(cache_request, DummyRequest())
+        service._cache_backend = SharedStoreBackend(store)
+        workers.append(service)
+    started = time.monotonic()
+    holder, waiter = await asyncio.gather(*(w.get_weather() for w in workers))
+    elapsed = time.monotonic() - started
+    assert UpstreamService.upstream_calls == 1
+    assert holder == (0, False, {"city": "kyiv"})
+    assert waiter == (60, True, {"city": "kyiv"})
+    assert elapsed < FETCH_LEASE_WAIT / 2
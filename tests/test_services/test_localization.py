@@ -0,0 +1,53 @@
+import pytest
+
+from constants import Language, Units
+from services.localization import (convert_temperature, localize_weather,
+                                   translate_condition)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("+25°C", "+77°F"),
+        ("-40°C", "-40°F"),
+        ("0°C", "+32°F"),
+        ("+20C", "+68F"),
+        ("n/a", "n/a"),
+    ],
+)
+def test_convert_temperature_imperial(value, expected):
+    assert convert_temperature(value, Units.IMPERIAL) == expected
+
+
+def test_convert_temperature_metric_is_unchanged():
+    assert convert_temperature("+25°C", Units.METRIC) == "+25°C"
+
+
+@pytest.mark.parametrize(
+    "condition, lang, expected",
+    [
+        ("Sunny", Language.UKRAINIAN, "Сонячно"),
+        ("Light rain, mist", Language.FRENCH, "Pluie légère, Brume"),
+        ("Partly cloudy ", Language.SPANISH, "Parcialmente nublado"),
+        ("Volcanic ash", Language.GERMAN, "Volcanic ash"),
+        ("Sunny", Language.ENGLISH, "Sunny"),
+    ],
+)
+def test_translate_condition(condition, lang, expected):
+    assert translate_condition(condition, lang) == expected
+
+
+def test_localize_weather_default_returns_same_record():
+    record = {"city": "x", "weather condition": "Clear", "actual temperature": "+1°C"}
+    assert localize_weather(record, Units.METRIC, Language.ENGLISH) is record
+
+
+def test_localize_weather_does_not_mutate_record():
+    record = {"city": "x", "weather condition": "Clear", "actual temperature": "+1°C"}
+    localized = localize_weather(record, Units.IMPERIAL, Language.UKRAINIAN)
+    assert localized == {
+        "city": "x",
+        "weather condition": "Ясно",
+        "actual temperature": "+34°F",
+    }
+    assert record["actual temperature"] == "+1°C"
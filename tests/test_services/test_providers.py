@@ -0,0 +1,206 @@
+import httpx
+import pytest
+
+from constants import PROVIDER_MAX_FAILURES, HTTPResponseCode
+from exceptions import UpstreamUnavailableError, WeatherServiceError
+from services import providers
+from services.providers import (FixtureProvider, ProviderChain, ProviderHealth,
+                                WeatherProvider, WttrProvider, create_provider)
+from tests.test_services.test_forecast import J1_PAYLOAD
+
+
+def test_wttr_query_urls():
+    provider = WttrProvider()
+    assert (
+        provider._query_url("TestCity")
+        == "https://wttr.in/TestCity?format=%l:%C,%t&m&lang=en"
+    )
+    assert provider._rich_query_url("kyiv") == "https://wttr.in/kyiv?format=j1&lang=en"
+
+
+def test_parse_weather_response_success():
+    result = WttrProvider()._parse_weather_response("X", "X:Clear,+25C")
+    assert result == {
+        "city": "X",
+        "weather condition": "Clear",
+        "actual temperature": "+25C",
+    }
+
+
+@pytest.mark.parametrize("city", ["st. louis (mo)", "a+b", "x[1]"])
+def test_parse_weather_response_city_is_not_a_pattern(city):
+    provider = WttrProvider()
+    result = provider._parse_weather_response(city, f"{city}:Clear,+25C")
+    assert result["weather condition"] == "Clear"
+    with pytest.raises(WeatherServiceError):
+        provider._parse_weather_response(city, "other:Clear,+25C")
+
+
+def test_parse_weather_response_failure():
+    with pytest.raises(WeatherServiceError) as excinfo:
+        WttrProvider()._parse_weather_response("Y", "InvalidResponse")
+    assert excinfo.value.status_code == HTTPResponseCode.INTERNAL_SERVER_ERROR.value
+
+
+class StatusClient:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = "error"
+
+    async def get(self, url):
+        if self.status_code is None:
+            raise httpx.ConnectTimeout("timed out")
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "status_code, unavailable", [(None, True), (503, True), (404, False)]
+)
+async def test_wttr_error_classification(monkeypatch, status_code, unavailable):
+    monkeypatch.setattr(httpx, "AsyncClient", lambda: StatusClient(status_code))
+    with pytest.raises(WeatherServiceError) as excinfo:
+        await WttrProvider().fetch_current("kyiv")
+    assert isinstance(excinfo.value, UpstreamUnavailableError) is unavailable
+    assert excinfo.value.status_code == HTTPResponseCode.BAD_GATEWAY.value
+
+
+@pytest.mark.asyncio
+async def test_fixture_provider_records():
+    provider = FixtureProvider({"Kyiv": J1_PAYLOAD})
+    assert await provider.fetch_current("kyiv") == {
+        "city": "kyiv",
+        "weather condition": "Sunny",
+        "actual temperature": "+20°C",
+    }
+    assert (await provider.fetch_rich("kyiv"))["current"]["humidity"] == 60
+
+
+@pytest.mark.asyncio
+async def test_fixture_provider_unknown_city():
+    with pytest.raises(WeatherServiceError) as excinfo:
+        await FixtureProvider({}).fetch_current("kyiv")
+    assert excinfo.value.status_code == HTTPResponseCode.BAD_GATEWAY.value
+
+
+@pytest.mark.asyncio
+async def test_fixture_provider_from_directory(tmp_path):
+    (tmp_path / "kyiv.json").write_text(J1_PAYLOAD)
+    (tmp_path / "notes.txt").write_text("ignored")
+    provider = FixtureProvider.from_directory(str(tmp_path))
+    assert (await provider.fetch_current("kyiv"))["city"] == "kyiv"
+    with pytest.raises(WeatherServiceError):
+        await provider.fetch_current("notes")
+
+
+class FakeProvider(WeatherProvider):
+    def __init__(self, name, fail=False, error_class=UpstreamUnavailableError):
+        self.name = name
+        self.fail = fail
+        self.error_class = error_class
+        self.calls = 0
+
+    async def fetch_current(self, city):
+        self.calls += 1
+        if self.fail:
+            raise self.error_class(
+                message=f"Fail to get a response for {city}",
+                status_code=HTTPResponseCode.BAD_GATEWAY.value,
+            )
+        return {"city": city, "provider": self.name}
+
+    async def fetch_rich(self, city):
+        return await self.fetch_current(city)
+
+
+def test_provider_health_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(providers.time, "monotonic", lambda: now[0])
+    health = ProviderHealth()
+    for _ in range(PROVIDER_MAX_FAILURES - 1):
+        health.record_failure()
+    assert health.healthy
+    health.record_failure()
+    assert not health.healthy
+    now[0] += providers.PROVIDER_COOLDOWN
+    assert health.healthy
+
+
+def test_provider_health_smoothed_latency():
+    health = ProviderHealth()
+    health.record_success(1.0)
+    health.record_success(2.0)
+    assert health.latency == pytest.approx(1.3)
+
+
+@pytest.mark.asyncio
+async def test_provider_chain_fails_over_in_order():
+    primary, secondary = FakeProvider("primary", fail=True), FakeProvider("second")
+    chain = ProviderChain([primary, secondary])
+    assert await chain.fetch_current("kyiv") == {"city": "kyiv", "provider": "second"}
+    assert chain.health["primary"].failures == 1
+    assert chain.health["second"].latency is not None
+
+
+@pytest.mark.asyncio
+async def test_provider_chain_skips_unhealthy_provider():
+    primary, secondary = FakeProvider("primary", fail=True), FakeProvider("second")
+    chain = ProviderChain([primary, secondary])
+    for _ in range(PROVIDER_MAX_FAILURES + 2):
+        await chain.fetch_rich("kyiv")
+    assert primary.calls == PROVIDER_MAX_FAILURES
+
+
+@pytest.mark.asyncio
+async def test_provider_chain_fails_over_without_penalty():
+    primary = FakeProvider("primary", fail=True, error_class=WeatherServiceError)
+    secondary = FakeProvider("second")
+    chain = ProviderChain([primary, secondary])
+    for _ in range(PROVIDER_MAX_FAILURES + 2):
+        assert (await chain.fetch_current("kyiv"))["provider"] == "second"
+    assert primary.calls == PROVIDER_MAX_FAILURES + 2
+    assert chain.health["primary"].failures == 0
+    assert chain.health["primary"].healthy
+
+
+@pytest.mark.asyncio
+async def test_provider_chain_all_failing():
+    chain = ProviderChain([FakeProvider("a", fail=True), FakeProvider("b", fail=True)])
+    with pytest.raises(WeatherServiceError) as excinfo:
+        await chain.fetch_current("kyiv")
+    assert excinfo.value.status_code == HTTPResponseCode.BAD_GATEWAY.value
+
+
+@pytest.mark.asyncio
+async def test_provider_chain_fastest_strategy():
+    slow, fast = FakeProvider("slow"), FakeProvider("fast")
+    chain = ProviderChain([slow, fast], strategy="fastest")
+    chain.health["slow"].record_success(2.0)
+    chain.health["fast"].record_success(0.1)
+    assert (await chain.fetch_current("kyiv"))["provider"] == "fast"
+    assert slow.calls == 0
+
+
+@pytest.mark.parametrize(
+    "providers_, strategy", [([], "ordered"), ([FakeProvider("a")], "random")]
+)
+def test_provider_chain_invalid_setup(providers_, strategy):
+    with pytest.raises(ValueError):
+        ProviderChain(providers_, strategy)
+
+
+def test_create_provider(tmp_path):
+    assert isinstance(create_provider(["wttr"]), WttrProvider)
+    chain = create_provider(["fixture", "wttr"], "fastest", str(tmp_path))
+    assert isinstance(chain, ProviderChain)
+    assert list(chain.health) == ["fixture", "wttr"]
+    with pytest.raises(ValueError):
+        create_provider(["fixture"])
+    with pytest.raises(ValueError):
+        create_provider(["openweather"])
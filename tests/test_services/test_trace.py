@@ -0,0 +1,28 @@
+import json
+import os
+
+from services.trace import TraceRecorder
+
+
+def test_trace_recorder_appends_jsonl(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"ts":1}\n')
+    recorder = TraceRecorder(str(path))
+    recorder.record("kyiv", 600, False, False, 0.123456)
+    recorder.record("kyiv", 600, False, True, None)
+    recorder.record("kyiv", 600, True, False, 0.5, error=True)
+    recorder.close()
+    lines = path.read_text().splitlines()
+    assert lines[0] == '{"ts":1}'
+    miss, hit, failed = (json.loads(line) for line in lines[1:])
+    assert miss["key"] == "kyiv"
+    assert miss["ttl"] == 600
+    assert miss["bypass"] is False
+    assert miss["hit"] is False
+    assert miss["latency"] == 0.1235
+    assert miss["pid"] == os.getpid()
+    assert hit["hit"] is True
+    assert hit["latency"] is None
+    assert miss["error"] is False
+    assert failed["error"] is True
+    assert miss["ts"] <= hit["ts"] <= failed["ts"]
@@ -1,12 +1,15 @@
 import json
-import re
 
 import httpx
 import pytest
 
+from constants import HTTPResponseCode, Language, Units
+from exceptions import WeatherServiceError
+from services import providers
 from services.cache import FastAPICache
-from services.weather import (HTTPResponseCode, WeatherService,
-                              WeatherServiceError)
+from services.providers import FixtureProvider
+from services.weather import WeatherService
+from tests.test_services.test_forecast import J1_PAYLOAD
 
 
 class DummyRequest:
@@ -15,10 +18,19 @@ class DummyRequest:
 
 
 class DummyWeatherRequest:
-    def __init__(self, city, cache_ttl=None, cache_bypass=False):
+    def __init__(
+        self,
+        city,
+        cache_ttl=None,
+        cache_bypass=False,
+        units=Units.METRIC,
+        lang=Language.ENGLISH,
+    ):
         self.city = city
         self.cache_ttl = cache_ttl
         self.cache_bypass = cache_bypass
+        self.units = units
+        self.lang = lang
 
 
 class FakeBackend:
@@ -44,39 +56,20 @@ def patch_backend(monkeypatch):
     return backend
 
 
-def test_init_fields_and_pattern():
+def test_init_fields():
     req = DummyWeatherRequest(city="TestCity", cache_ttl=3, cache_bypass=True)
     request = DummyRequest(headers={})
     service = WeatherService(req, request)
     assert service._city == "TestCity"
-    assert service._query_url == "https://wttr.in/TestCity?format=%l:%C,%t"
-    assert isinstance(service._response_pattern, re.Pattern)
     # Inherited cache fields
     assert isinstance(service.cache_ttl, int)
     assert isinstance(service.cache_bypass, bool)
     assert hasattr(service, "cache_backend")
 
 
-def test_parse_weather_response_success():
-    req = DummyWeatherRequest(city="X", cache_ttl=None, cache_bypass=False)
-    request = DummyRequest()
-    service = WeatherService(req, request)
-    text = "X:Clear,+25C"
-    result = service._parse_weather_response(text)
-    assert result == {
-        "city": "X",
-        "weather condition": "Clear",
-        "actual temperature": "+25C",
-    }
-
-
-def test_parse_weather_response_failure():
-    req = DummyWeatherRequest(city="Y", cache_ttl=None, cache_bypass=False)
-    request = DummyRequest()
-    service = WeatherService(req, request)
-    with pytest.raises(WeatherServiceError) as excinfo:
-        service._parse_weather_response("InvalidResponse")
-    assert excinfo.value.status_code == HTTPResponseCode.INTERNAL_SERVER_ERROR.value
+def test_service_has_no_instance_dict():
+    service = WeatherService(DummyWeatherRequest(city="X"), DummyRequest())
+    assert not hasattr(service, "__dict__")
 
 
 class ErrorClient:
@@ -160,13 +153,13 @@ async def test_get_weather_success_and_parse(monkeypatch, patch_backend):
 @pytest.mark.asyncio
 async def test_get_weather_cache_hit(monkeypatch, patch_backend):
     data = {"city": "City2", "weather condition": "Rain", "actual temperature": "+10C"}
-    patch_backend.store["City2"] = json.dumps(data).encode()
+    patch_backend.store["current:City2"] = json.dumps(data).encode()
     req = DummyWeatherRequest(city="City2", cache_ttl=None, cache_bypass=False)
     request = DummyRequest()
     service = WeatherService(req, request)
     result = await service.get_weather()
     assert result == (0, True, data)
-    assert patch_backend.get_calls == ["City2"]
+    assert patch_backend.get_calls == ["current:City2"]
     assert patch_backend.set_calls == []
 
 
@@ -174,6 +167,7 @@ async def test_get_weather_cache_hit(monkeypatch, patch_backend):
 async def test_get_weather_cache_miss_then_set(monkeypatch, patch_backend):
     text = "City3:Cloudy,+20C"
     monkeypatch.setattr(httpx, "AsyncClient", lambda: SuccessClient(text))
+    monkeypatch.setattr(WeatherService, "cache_ttl_jitter", 0)
     req = DummyWeatherRequest(city="City3", cache_ttl=12, cache_bypass=False)
     request = DummyRequest()
     service = WeatherService(req, request)
@@ -183,9 +177,84 @@ async def test_get_weather_cache_miss_then_set(monkeypatch, patch_backend):
         False,
         {"city": "City3", "weather condition": "Cloudy", "actual temperature": "+20C"},
     )
-    assert patch_backend.get_calls == ["City3"]
+    assert patch_backend.get_calls == ["current:City3"]
     assert len(patch_backend.set_calls) == 1
     key, raw, expire = patch_backend.set_calls[0]
-    assert key == "City3"
+    assert key == "current:City3"
     assert json.loads(raw.decode()) == result[-1]
     assert expire == 12
+
+
+@pytest.mark.asyncio
+async def test_get_weather_variants_share_cache_entry(monkeypatch, patch_backend):
+    data = {
+        "city": "city4",
+        "weather condition": "Sunny",
+        "actual temperature": "+25°C",
+    }
+    patch_backend.store["current:city4"] = json.dumps(data).encode()
+    req = DummyWeatherRequest(city="city4", units=Units.IMPERIAL, lang=Language.GERMAN)
+    service = WeatherService(req, DummyRequest())
+    result = await service.get_weather()
+    assert result == (
+        0,
+        True,
+        {"city": "city4", "weather condition": "Sonnig", "actual temperature": "+77°F"},
+    )
+    assert patch_backend.get_calls == ["current:city4"]
+    assert json.loads(patch_backend.store["current:city4"].decode()) == data
+
+
+@pytest.mark.asyncio
+async def test_get_view_shares_one_rich_fetch(monkeypatch, patch_backend):
+    calls = []
+
+    class RichClient(SuccessClient):
+        async def get(self, url):
+            calls.append(url)
+            return self
+
+    monkeypatch.setattr(httpx, "AsyncClient", lambda: RichClient(J1_PAYLOAD))
+    req = DummyWeatherRequest(city="kyiv")
+    views = {}
+    for view in ("current", "hourly", "forecast"):
+        service = WeatherService(req, DummyRequest())
+        views[view] = await service.get_view(view)
+    assert calls == ["https://wttr.in/kyiv?format=j1&lang=en"]
+    assert [key for key, *_ in patch_backend.set_calls] == ["j1:kyiv"]
+    assert views["current"][1] is False
+    assert views["hourly"][1] is True
+    assert views["forecast"][1] is True
+    assert views["current"][2]["temperature"] == 20
+
+
+@pytest.mark.asyncio
+async def test_plain_and_rich_keys_never_collide(monkeypatch, patch_backend):
+    provider = FixtureProvider({"kyiv": J1_PAYLOAD, "j1:kyiv": J1_PAYLOAD})
+    monkeypatch.setattr(providers, "_weather_provider", provider)
+    await WeatherService(DummyWeatherRequest(city="kyiv"), DummyRequest()).get_view(
+        "current"
+    )
+    colliding = DummyWeatherRequest(city="j1:kyiv", lang=Language.GERMAN)
+    cache_ttl, cache_hit, response = await WeatherService(
+        colliding, DummyRequest()
+    ).get_weather()
+    assert cache_hit is False
+    assert set(response) == {"city", "weather condition", "actual temperature"}
+    assert [key for key, *_ in patch_backend.set_calls] == [
+        "j1:kyiv",
+        "current:j1:kyiv",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_weather_uses_configured_provider(monkeypatch, patch_backend):
+    provider = FixtureProvider({"kyiv": J1_PAYLOAD})
+    monkeypatch.setattr(providers, "_weather_provider", provider)
+    service = WeatherService(DummyWeatherRequest(city="kyiv"), DummyRequest())
+    result = await service.get_weather()
+    assert result == (
+        0,
+        False,
+        {"city": "kyiv", "weather condition": "Sunny", "actual temperature": "+20°C"},
+    )
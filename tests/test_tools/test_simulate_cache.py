@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from tools.simulate_cache import SimulatedCache, load_trace, main, simulate
+
+
+def _record(ts, key, ttl=60, bypass=False, latency=None, error=False):
+    return {
+        "ts": ts,
+        "key": key,
+        "ttl": ttl,
+        "bypass": bypass,
+        "hit": False,
+        "latency": latency,
+        "error": error,
+        "pid": 1,
+    }
+
+
+def test_simulated_cache_expiry():
+    cache = SimulatedCache("lru", None)
+    cache.set("a", 0, 10)
+    assert cache.get("a", 9.9) is True
+    assert cache.get("a", 10) is False
+
+
+@pytest.mark.parametrize(
+    "policy, survivor, victim",
+    [("lru", "a", "b"), ("fifo", "b", "a"), ("lfu", "a", "b")],
+)
+def test_simulated_cache_eviction(policy, survivor, victim):
+    cache = SimulatedCache(policy, 2)
+    cache.set("a", 0, 100)
+    cache.set("b", 1, 100)
+    cache.get("a", 2)
+    cache.set("c", 3, 100)
+    assert cache.get(survivor, 4) is True
+    assert cache.get(victim, 4) is False
+
+
+def test_simulated_cache_unknown_policy():
+    with pytest.raises(ValueError):
+        SimulatedCache("random", None)
+
+
+def test_simulate_ttl_and_bypass():
+    records = [
+        _record(0, "a", latency=0.5),
+        _record(30, "a"),
+        _record(70, "a", latency=0.5),
+        _record(71, "a", bypass=True, latency=0.5),
+    ]
+    assert simulate(records, None, "lru", None, 1) == {
+        "requests": 4,
+        "hits": 1,
+        "hit_ratio": 0.25,
+        "upstream_calls": 3,
+        "upstream_time": 1.5,
+    }
+    assert simulate(records, 3600, "lru", None, 1)["hits"] == 2
+
+
+def test_simulate_workers_split_caches():
+    records = [_record(ts, "a") for ts in range(4)]
+    assert simulate(records, None, "lru", None, 1)["upstream_calls"] == 1
+    assert simulate(records, None, "lru", None, 2)["upstream_calls"] == 2
+    assert simulate(records, None, "lru", None, 2, shared=True)["hits"] == 3
+
+
+def test_simulate_failed_calls_are_not_cached():
+    records = [_record(1, "a", error=True), _record(2, "a"), _record(3, "a")]
+    result = simulate(records, None, "lru", None, 1)
+    assert result["upstream_calls"] == 2
+    assert result["hits"] == 1
+
+
+def test_main_reports_grid(tmp_path, capsys):
+    path = tmp_path / "trace.jsonl"
+    records = [_record(2, "b"), _record(1, "a"), _record(3, "a")]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    assert [record["ts"] for record in load_trace(str(path))] == [1, 2, 3]
+    main([str(path), "--ttl", "1", "60", "--policy", "lru", "lfu"])
+    rows = capsys.readouterr().out.splitlines()
+    assert len(rows) == 5
+    assert "33.3%" in rows[-1]
+
+
+@pytest.mark.parametrize("capacity", ["0", "-1"])
+def test_main_rejects_non_positive_capacity(tmp_path, capsys, capacity):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps(_record(1, "a")) + "\n")
+    with pytest.raises(SystemExit):
+        main([str(path), "--capacity", capacity])
+    assert "capacity must be at least 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_main_rejects_non_positive_workers(tmp_path, capsys, workers):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps(_record(1, "a")) + "\n")
+    with pytest.raises(SystemExit):
+        main([str(path), "--workers", workers])
+    assert "is not at least 1" in capsys.readouterr().err
+
+
+def test_main_rejects_non_positive_ttl(tmp_path, capsys):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(json.dumps(_record(1, "a")) + "\n")
+    with pytest.raises(SystemExit):
+        main([str(path), "--ttl", "0"])
+    assert "is not at least 1" in capsys.readouterr().err
@@ -56,3 +56,39 @@ def test_weather_request_missing_or_bad_city(bad_city):
 def test_weather_request_missing_city_field():
     with pytest.raises(ValidationError):
         weather.WeatherRequest(cache_ttl=1, cache_bypass=False)
+
+
+def test_weather_request_variant_defaults():
+    wr = weather.WeatherRequest(city="Kyiv")
+    assert wr.units == "metric"
+    assert wr.lang == "en"
+
+
+@pytest.mark.parametrize(
+    "units,lang", [("imperial", "uk"), ("metric", "de"), ("imperial", "en")]
+)
+def test_weather_request_variants(units, lang):
+    wr = weather.WeatherRequest(city="Kyiv", units=units, lang=lang)
+    assert wr.units == units
+    assert wr.lang == lang
+
+
+@pytest.mark.parametrize("payload", [{"units": "kelvin"}, {"lang": "xx"}])
+def test_weather_request_invalid_variants(payload):
+    with pytest.raises(ValidationError):
+        weather.WeatherRequest(city="Kyiv", **payload)
+
+
+def test_weather_batch_request_normalizes_and_deduplicates():
+    wr = weather.WeatherBatchRequest(cities=["Kyiv", "LVIV", "kyiv"], cache_ttl=5)
+    assert wr.cities == ["kyiv", "lviv"]
+    city_requests = wr.city_requests()
+    assert [request.city for request in city_requests] == ["kyiv", "lviv"]
+    assert all(request.cache_ttl == 5 for request in city_requests)
+    assert all(request.units == "metric" for request in city_requests)
+
+
+@pytest.mark.parametrize("cities", [[], ["x"] * 51, None])
+def test_weather_batch_request_invalid_cities(cities):
+    with pytest.raises(ValidationError):
+        weather.WeatherBatchRequest(cities=cities)
@@ -0,0 +1,173 @@
+"""Offline cache-policy simulator.
+
+Replays a trace written by ``services.trace.TraceRecorder`` against different
+TTLs, eviction policies, capacities and worker counts, and reports the
+predicted hit ratio and upstream call volume:
+
+    python -m tools.simulate_cache trace.jsonl --ttl 600 3600 \\
+        --policy lru lfu --capacity 100 1000 --workers 1 4
+
+Each worker keeps its own cache, as with the in-memory backend, and requests
+are spread over workers round-robin. ``--shared`` models one cache shared by
+all workers, as with Redis. Failed upstream calls still count as upstream
+calls but store nothing. TTL jitter and early refresh are not modelled.
+"""
+
+import argparse
+import itertools
+import json
+from collections import OrderedDict
+from typing import Optional
+
+POLICIES = ("lru", "lfu", "fifo")
+
+
+class SimulatedCache:
+
+    def __init__(self, policy: str, capacity: Optional[int]):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy}")
+        self._policy = policy
+        self._capacity = capacity
+        self._expires: OrderedDict[str, float] = OrderedDict()
+        self._uses: dict[str, int] = {}
+
+    def get(self, key: str, now: float) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            self._remove(key)
+            return False
+        if self._policy == "lru":
+            self._expires.move_to_end(key)
+        self._uses[key] += 1
+        return True
+
+    def set(self, key: str, now: float, ttl: int) -> None:
+        if key in self._expires:
+            self._remove(key)
+        elif self._capacity is not None and len(self._expires) >= self._capacity:
+            self._evict()
+        self._expires[key] = now + ttl
+        self._uses[key] = 1
+
+    def _evict(self) -> None:
+        if self._policy == "lfu":
+            victim = min(self._expires, key=self._uses.__getitem__)
+        else:
+            victim = next(iter(self._expires))
+        self._remove(victim)
+
+    def _remove(self, key: str) -> None:
+        del self._expires[key]
+        del self._uses[key]
+
+
+def load_trace(path: str) -> list[dict]:
+    with open(path) as trace_file:
+        records = [json.loads(line) for line in trace_file if line.strip()]
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def simulate(
+    records: list[dict],
+    ttl: Optional[int],
+    policy: str,
+    capacity: Optional[int],
+    workers: int,
+    shared: bool = False,
+) -> dict:
+    """Replay records, using each record's own TTL when ``ttl`` is None."""
+    caches = [SimulatedCache(policy, capacity) for _ in range(1 if shared else workers)]
+    requests = hits = upstream_calls = 0
+    upstream_time = 0.0
+    latencies = [r["latency"] for r in records if r.get("latency") is not None]
+    mean_latency = sum(latencies) / len(latencies) if latencies else 0.0
+    for index, record in enumerate(records):
+        requests += 1
+        if record["bypass"] or record["key"] is None:
+            upstream_calls += 1
+            upstream_time += mean_latency
+            continue
+        cache = caches[0 if shared else index % workers]
+        if cache.get(record["key"], record["ts"]):
+            hits += 1
+            continue
+        upstream_calls += 1
+        upstream_time += mean_latency
+        if not record.get("error"):
+            cache.set(
+                record["key"],
+                record["ts"],
+                ttl if ttl is not None else record["ttl"],
+            )
+    return {
+        "requests": requests,
+        "hits": hits,
+        "hit_ratio": hits / requests if requests else 0.0,
+        "upstream_calls": upstream_calls,
+        "upstream_time": upstream_time,
+    }
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not at least 1")
+    return number
+
+
+def _parse_capacity(value: str) -> Optional[int]:
+    if value == "none":
+        return None
+    capacity = int(value)
+    if capacity < 1:
+        raise argparse.ArgumentTypeError("capacity must be at least 1 or 'none'")
+    return capacity
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="JSONL trace written with CACHE_TRACE_PATH")
+    parser.add_argument(
+        "--ttl",
+        type=_positive_int,
+        nargs="+",
+        default=[None],
+        help="TTLs in seconds to try, defaults to the TTL requested in the trace",
+    )
+    parser.add_argument("--policy", nargs="+", choices=POLICIES, default=["lru"])
+    parser.add_argument(
+        "--capacity",
+        type=_parse_capacity,
+        nargs="+",
+        default=[None],
+        help="cache sizes in entries per cache, 'none' for unbounded",
+    )
+    parser.add_argument("--workers", type=_positive_int, nargs="+", default=[1])
+    parser.add_argument(
+        "--shared", action="store_true", help="all workers share one cache"
+    )
+    args = parser.parse_args(argv)
+
+    records = load_trace(args.trace)
+    print(
+        f"{'ttl':>8} {'policy':>6} {'capacity':>8} {'workers':>7} "
+        f"{'hit ratio':>9} {'upstream':>8} {'upstream s':>10}"
+    )
+    for ttl, policy, capacity, workers in itertools.product(
+        args.ttl, args.policy, args.capacity, args.workers
+    ):
+        result = simulate(records, ttl, policy, capacity, workers, args.shared)
+        ttl_label = "trace" if ttl is None else ttl
+        print(
+            f"{ttl_label:>8} {policy:>6} {capacity or 'none':>8} {workers:>7} "
+            f"{result['hit_ratio']:>9.1%} {result['upstream_calls']:>8} "
+            f"{result['upstream_time']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
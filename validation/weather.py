@@ -1,13 +1,39 @@
 """Weather request validation models."""
 
-from pydantic import field_validator
+from pydantic import Field, field_validator
 
+from constants import MAX_BATCH_CITIES, Language, Units
 from validation.cache import CacheRequest
 
 
 class WeatherRequest(CacheRequest):
     city: str
+    units: Units = Units.METRIC
+    lang: Language = Language.ENGLISH
 
     @field_validator("city")
     def normalize_city(cls, city: str):
         return city.lower()
+
+
+class WeatherBatchRequest(CacheRequest):
+    cities: list[str] = Field(min_length=1, max_length=MAX_BATCH_CITIES)
+    units: Units = Units.METRIC
+    lang: Language = Language.ENGLISH
+
+    @field_validator("cities")
+    def normalize_cities(cls, cities: list[str]):
+        return list(dict.fromkeys(city.lower() for city in cities))
+
+    def city_requests(self) -> list[WeatherRequest]:
+        """Split into already validated per-city requests."""
+        return [
+            WeatherRequest.model_construct(
+                city=city,
+                cache_ttl=self.cache_ttl,
+                cache_bypass=self.cache_bypass,
+                units=self.units,
+                lang=self.lang,
+            )
+            for city in self.cities
+        ]